@@ -0,0 +1,39 @@
+"""add created_at to list and user
+
+Revision ID: 4c1f8e2a9b7d
+Revises: 83697dcbef8a
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "4c1f8e2a9b7d"
+down_revision = "83697dcbef8a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are backfilled with the migration time so that keyset
+    # pagination on (created_at, id) has a value to order by.
+    op.add_column(
+        "list",
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+    )
+    op.add_column(
+        "user",
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("user", "created_at")
+    op.drop_column("list", "created_at")
@@ -0,0 +1,133 @@
+"""add family events
+
+Revision ID: a93d6e0b4c57
+Revises: f5c08b2d61e4
+Create Date: 2026-10-18 16:20:11.052318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "a93d6e0b4c57"
+down_revision = "f5c08b2d61e4"
+branch_labels = None
+depends_on = None
+
+
+# bump_owner_versions gains the kind of write that caused the bump and sends
+# it, with the new version, on the family_events channel for every family it
+# bumps. NOTIFY is transactional: subscribers hear about a write once it
+# commits, and never about one that is rolled back.
+TASK_LIST_IDS = {
+    "insert": "SELECT list_id FROM new_tasks",
+    "delete": "SELECT list_id FROM old_tasks",
+    "update": "SELECT list_id FROM new_tasks UNION SELECT list_id FROM old_tasks",
+}
+LIST_TABLES = {"insert": "changed_lists", "delete": "changed_lists"}
+
+NOTIFYING_BUMP = """
+    CREATE FUNCTION bump_owner_versions(
+        user_ids uuid[], family_ids uuid[], source text
+    ) RETURNS void LANGUAGE sql AS $$
+        WITH bumped AS (
+            UPDATE family SET version = version + 1
+            WHERE id = ANY(family_ids)
+            RETURNING id, version
+        )
+        SELECT pg_notify(
+            'family_events',
+            json_build_object(
+                'type', source, 'family_id', id, 'version', version
+            )::text
+        )
+        FROM bumped;
+        UPDATE "user" SET version = version + 1 WHERE id = ANY(user_ids);
+    $$
+"""
+SILENT_BUMP = """
+    CREATE FUNCTION bump_owner_versions(user_ids uuid[], family_ids uuid[])
+    RETURNS void LANGUAGE sql AS $$
+        UPDATE family SET version = version + 1 WHERE id = ANY(family_ids);
+        UPDATE "user" SET version = version + 1 WHERE id = ANY(user_ids);
+    $$
+"""
+
+
+def trigger_functions(with_source: bool) -> list[str]:
+    def source(table: str, operation: str) -> str:
+        return f", '{table}.{operation}'" if with_source else ""
+
+    functions = []
+    for operation, list_ids in TASK_LIST_IDS.items():
+        functions.append(
+            f"""
+            CREATE OR REPLACE FUNCTION task_{operation}_owner_versions()
+            RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                PERFORM bump_owner_versions(
+                    ARRAY(SELECT DISTINCT user_id FROM list
+                          WHERE id IN ({list_ids}) AND user_id IS NOT NULL),
+                    ARRAY(SELECT DISTINCT family_id FROM list
+                          WHERE id IN ({list_ids}) AND family_id IS NOT NULL)
+                    {source("task", operation)}
+                );
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+    for operation, name in LIST_TABLES.items():
+        functions.append(
+            f"""
+            CREATE OR REPLACE FUNCTION list_{operation}_owner_versions()
+            RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                PERFORM bump_owner_versions(
+                    ARRAY(SELECT DISTINCT user_id FROM {name}
+                          WHERE user_id IS NOT NULL),
+                    ARRAY(SELECT DISTINCT family_id FROM {name}
+                          WHERE family_id IS NOT NULL)
+                    {source("list", operation)}
+                );
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+    functions.append(
+        f"""
+        CREATE OR REPLACE FUNCTION list_update_owner_versions()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM bump_owner_versions(
+                ARRAY(SELECT DISTINCT user_id
+                      FROM (VALUES (OLD.user_id), (NEW.user_id)) AS ids(user_id)
+                      WHERE user_id IS NOT NULL),
+                ARRAY(SELECT DISTINCT family_id
+                      FROM (VALUES (OLD.family_id), (NEW.family_id)) AS ids(family_id)
+                      WHERE family_id IS NOT NULL)
+                {source("list", "update")}
+            );
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    return functions
+
+
+def upgrade():
+    op.execute(NOTIFYING_BUMP)
+    for function in trigger_functions(with_source=True):
+        op.execute(function)
+    op.execute("DROP FUNCTION bump_owner_versions(uuid[], uuid[])")
+
+
+def downgrade():
+    op.execute(SILENT_BUMP)
+    for function in trigger_functions(with_source=False):
+        op.execute(function)
+    op.execute("DROP FUNCTION bump_owner_versions(uuid[], uuid[], text)")
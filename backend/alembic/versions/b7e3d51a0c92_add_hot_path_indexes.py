@@ -0,0 +1,84 @@
+"""add hot path indexes
+
+Revision ID: b7e3d51a0c92
+Revises: 4c1f8e2a9b7d
+Create Date: 2026-10-18 10:04:17.552931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "b7e3d51a0c92"
+down_revision = "4c1f8e2a9b7d"
+branch_labels = None
+depends_on = None
+
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction, so every index is
+# built in an autocommit block. If a build fails it leaves an INVALID index
+# behind that has to be dropped before re-running the migration.
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_family_invite_code"),
+            "family",
+            ["invite_code"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_user_family_id"),
+            "user",
+            ["family_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_list_user_id"),
+            "list",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_list_family_id"),
+            "list",
+            ["family_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_task_list_id_created_at_id",
+            "task",
+            ["list_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_task_list_id_created_at_id",
+            table_name="task",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_list_family_id"), table_name="list", postgresql_concurrently=True
+        )
+        op.drop_index(
+            op.f("ix_list_user_id"), table_name="list", postgresql_concurrently=True
+        )
+        op.drop_index(
+            op.f("ix_user_family_id"), table_name="user", postgresql_concurrently=True
+        )
+        op.drop_index(
+            op.f("ix_family_invite_code"),
+            table_name="family",
+            postgresql_concurrently=True,
+        )
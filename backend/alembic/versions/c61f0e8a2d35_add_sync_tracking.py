@@ -0,0 +1,130 @@
+"""add sync tracking
+
+Revision ID: c61f0e8a2d35
+Revises: a93d6e0b4c57
+Create Date: 2026-10-18 17:12:36.740215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "c61f0e8a2d35"
+down_revision = "a93d6e0b4c57"
+branch_labels = None
+depends_on = None
+
+
+# updated_at is set by a BEFORE trigger to the start time of the writing
+# transaction, so it is maintained for ORM, bulk and raw writes alike. Sync
+# tokens are taken from the oldest open transaction (see read_changes), which
+# keeps a write that commits after a sync from being missed.
+#
+# Deletes are recorded in tombstone by statement-level triggers, scoped to the
+# user or family owning the list. A task deleted together with its list gets
+# no tombstone of its own; the list's tombstone covers it.
+TOMBSTONE_SOURCES = {
+    "task": """
+        SELECT old_rows.id, 'task', list.user_id, list.family_id
+        FROM old_rows JOIN list ON list.id = old_rows.list_id
+    """,
+    "list": """
+        SELECT id, 'list', user_id, family_id FROM old_rows
+    """,
+}
+
+
+def upgrade():
+    op.add_column("list", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE list SET updated_at = created_at")
+    op.alter_column("list", "updated_at", nullable=False)
+
+    op.create_table(
+        "tombstone",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("kind", sqlmodel.sql.sqltypes.AutoString(length=4), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=True),
+        sa.Column("family_id", sa.Uuid(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_tombstone_user_id_deleted_at", "tombstone", ["user_id", "deleted_at"]
+    )
+    op.create_index(
+        "ix_tombstone_family_id_deleted_at", "tombstone", ["family_id", "deleted_at"]
+    )
+    op.create_index(op.f("ix_tombstone_deleted_at"), "tombstone", ["deleted_at"])
+
+    op.execute(
+        """
+        CREATE FUNCTION set_updated_at() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.updated_at := now() AT TIME ZONE 'UTC';
+            RETURN NEW;
+        END;
+        $$
+        """
+    )
+    for table, source in TOMBSTONE_SOURCES.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_set_updated_at
+            BEFORE INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE FUNCTION {table}_delete_tombstones() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO tombstone (id, kind, user_id, family_id, deleted_at)
+                SELECT *, now() AT TIME ZONE 'UTC' FROM ({source}) AS deleted
+                ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_delete_tombstones
+            AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {table}_delete_tombstones()
+            """
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_list_id_updated_at",
+            "task",
+            ["list_id", "updated_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_task_list_id_updated_at",
+            table_name="task",
+            postgresql_concurrently=True,
+        )
+
+    for table in TOMBSTONE_SOURCES:
+        op.execute(f"DROP TRIGGER {table}_delete_tombstones ON {table}")
+        op.execute(f"DROP FUNCTION {table}_delete_tombstones()")
+        op.execute(f"DROP TRIGGER {table}_set_updated_at ON {table}")
+    op.execute("DROP FUNCTION set_updated_at()")
+
+    op.drop_index(op.f("ix_tombstone_deleted_at"), table_name="tombstone")
+    op.drop_index("ix_tombstone_family_id_deleted_at", table_name="tombstone")
+    op.drop_index("ix_tombstone_user_id_deleted_at", table_name="tombstone")
+    op.drop_table("tombstone")
+    op.drop_column("list", "updated_at")
@@ -0,0 +1,76 @@
+"""add task archive
+
+Revision ID: d4b18e6f2a70
+Revises: c61f0e8a2d35
+Create Date: 2026-10-18 19:41:05.218364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "d4b18e6f2a70"
+down_revision = "c61f0e8a2d35"
+branch_labels = None
+depends_on = None
+
+
+# task_archive is range partitioned by month of created_at. The partitions
+# are created on demand by archive_tasks, so there is none to begin with and
+# no default partition, which would get in the way of adding new ones. The
+# indexes are declared on the parent and created on every partition.
+def upgrade():
+    op.create_table(
+        "task_archive",
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column("notes", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("list_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(["list_id"], ["list.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_task_archive_created_at_brin",
+        "task_archive",
+        ["created_at"],
+        postgresql_using="brin",
+    )
+    op.create_index(
+        "ix_task_archive_list_id_created_at_id",
+        "task_archive",
+        ["list_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index("ix_task_archive_user_id", "task_archive", ["user_id"])
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_completed_updated_at",
+            "task",
+            ["updated_at"],
+            postgresql_where=sa.text("completed"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_task_completed_updated_at",
+            table_name="task",
+            postgresql_concurrently=True,
+        )
+
+    op.drop_index("ix_task_archive_user_id", table_name="task_archive")
+    op.drop_index("ix_task_archive_list_id_created_at_id", table_name="task_archive")
+    op.drop_index("ix_task_archive_created_at_brin", table_name="task_archive")
+    # Drops the partitions along with it
+    op.drop_table("task_archive")
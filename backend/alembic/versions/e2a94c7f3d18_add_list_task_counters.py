@@ -0,0 +1,118 @@
+"""add list task counters
+
+Revision ID: e2a94c7f3d18
+Revises: b7e3d51a0c92
+Create Date: 2026-10-18 13:41:09.204517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "e2a94c7f3d18"
+down_revision = "b7e3d51a0c92"
+branch_labels = None
+depends_on = None
+
+
+# The counters are maintained by statement-level triggers on task that read
+# the transition tables. A multi-row INSERT, UPDATE or DELETE, including an
+# ON DELETE CASCADE from user or list, therefore updates each affected list
+# row once per statement rather than once per task.
+TASK_COUNT_DELTAS = {
+    "insert": """
+        SELECT list_id,
+               count(*) FILTER (WHERE NOT completed) AS open_delta,
+               count(*) FILTER (WHERE completed) AS completed_delta
+        FROM new_tasks
+        GROUP BY list_id
+    """,
+    "delete": """
+        SELECT list_id,
+               -count(*) FILTER (WHERE NOT completed) AS open_delta,
+               -count(*) FILTER (WHERE completed) AS completed_delta
+        FROM old_tasks
+        GROUP BY list_id
+    """,
+    "update": """
+        SELECT list_id,
+               sum(open_delta) AS open_delta,
+               sum(completed_delta) AS completed_delta
+        FROM (
+            SELECT list_id, (NOT completed)::int AS open_delta,
+                   completed::int AS completed_delta
+            FROM new_tasks
+            UNION ALL
+            SELECT list_id, -(NOT completed)::int, -completed::int
+            FROM old_tasks
+        ) AS changes
+        GROUP BY list_id
+    """,
+}
+TRANSITION_TABLES = {
+    "insert": "NEW TABLE AS new_tasks",
+    "delete": "OLD TABLE AS old_tasks",
+    "update": "OLD TABLE AS old_tasks NEW TABLE AS new_tasks",
+}
+
+
+def upgrade():
+    op.add_column(
+        "list",
+        sa.Column("open_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "list",
+        sa.Column("completed_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE list
+        SET open_count = counts.open_count,
+            completed_count = counts.completed_count
+        FROM (
+            SELECT list_id,
+                   count(*) FILTER (WHERE NOT completed) AS open_count,
+                   count(*) FILTER (WHERE completed) AS completed_count
+            FROM task
+            GROUP BY list_id
+        ) AS counts
+        WHERE list.id = counts.list_id
+        """
+    )
+
+    for operation, deltas in TASK_COUNT_DELTAS.items():
+        op.execute(
+            f"""
+            CREATE FUNCTION task_{operation}_list_counts() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                UPDATE list
+                SET open_count = list.open_count + deltas.open_delta,
+                    completed_count = list.completed_count + deltas.completed_delta
+                FROM ({deltas}) AS deltas
+                WHERE list.id = deltas.list_id
+                  AND (deltas.open_delta <> 0 OR deltas.completed_delta <> 0);
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER task_{operation}_list_counts
+            AFTER {operation.upper()} ON task
+            REFERENCING {TRANSITION_TABLES[operation]}
+            FOR EACH STATEMENT EXECUTE FUNCTION task_{operation}_list_counts()
+            """
+        )
+
+
+def downgrade():
+    for operation in TASK_COUNT_DELTAS:
+        op.execute(f"DROP TRIGGER task_{operation}_list_counts ON task")
+        op.execute(f"DROP FUNCTION task_{operation}_list_counts()")
+    op.drop_column("list", "completed_count")
+    op.drop_column("list", "open_count")
@@ -0,0 +1,79 @@
+"""add task archive default partition
+
+Revision ID: e9c2b7a4f1d3
+Revises: d4b18e6f2a70
+Create Date: 2026-10-18 21:12:47.503921
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e9c2b7a4f1d3"
+down_revision = "d4b18e6f2a70"
+branch_labels = None
+depends_on = None
+
+
+# Creating a partition locks task_archive, and the list and user tables
+# through the partition's foreign keys, so it is kept out of requests.
+# Tasks archived into a month without a partition land in the default
+# partition. app.archive_tasks creates the monthly partitions ahead of time
+# with create_task_archive_partition, which also moves the month's rows out of
+# the default partition before attaching the new one.
+def upgrade():
+    op.execute("CREATE TABLE task_archive_default PARTITION OF task_archive DEFAULT")
+    op.execute(
+        """
+        CREATE FUNCTION create_task_archive_partition(month date) RETURNS boolean
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            first_day date := date_trunc('month', month);
+            next_first_day date := first_day + interval '1 month';
+            name text := 'task_archive_p' || to_char(first_day, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(name) IS NOT NULL THEN
+                RETURN false;
+            END IF;
+            -- Serializes concurrent callers creating the same partition
+            PERFORM pg_advisory_xact_lock(hashtext('task_archive'));
+            IF to_regclass(name) IS NOT NULL THEN
+                RETURN false;
+            END IF;
+
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE task_archive INCLUDING DEFAULTS)', name
+            );
+            EXECUTE format(
+                'WITH moved AS ('
+                '    DELETE FROM task_archive_default'
+                '    WHERE created_at >= %L AND created_at < %L RETURNING *'
+                ') INSERT INTO %I SELECT * FROM moved',
+                first_day, next_first_day, name
+            );
+            -- Creates the partition's indexes and foreign keys
+            EXECUTE format(
+                'ALTER TABLE task_archive ATTACH PARTITION %I '
+                'FOR VALUES FROM (%L) TO (%L)',
+                name, first_day, next_first_day
+            );
+            RETURN true;
+        END
+        $$
+        """
+    )
+
+
+def downgrade():
+    # Moves the default partition's rows into monthly partitions first
+    op.execute(
+        """
+        SELECT create_task_archive_partition(month)
+        FROM (
+            SELECT DISTINCT date_trunc('month', created_at)::date AS month
+            FROM task_archive_default
+        ) AS months
+        """
+    )
+    op.execute("DROP FUNCTION create_task_archive_partition(date)")
+    op.execute("DROP TABLE task_archive_default")
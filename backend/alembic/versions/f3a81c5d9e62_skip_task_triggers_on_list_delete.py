@@ -0,0 +1,92 @@
+"""skip task triggers on list delete
+
+Revision ID: f3a81c5d9e62
+Revises: e9c2b7a4f1d3
+Create Date: 2026-10-18 22:41:09.318274
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f3a81c5d9e62"
+down_revision = "e9c2b7a4f1d3"
+branch_labels = None
+depends_on = None
+
+
+# delete_list deletes a list's tasks in batches before the list itself, with
+# fridge.deleting_list_id set to the list's id for each batch's transaction.
+# The task delete triggers skip those tasks, so, as with the foreign key's
+# cascade, a task deleted together with its list gets no tombstone of its own
+# and the batches neither bump the owners' versions nor notify the family; the
+# list's delete does both once. The list's counters are still kept up to date.
+SKIPPED_LIST_ID = "nullif(current_setting('fridge.deleting_list_id', true), '')::uuid"
+
+
+def trigger_functions(skip_list_delete: bool) -> list[str]:
+    def deleted_tasks(transition_table: str) -> str:
+        if not skip_list_delete:
+            return transition_table
+        return f"""(
+            SELECT * FROM {transition_table}
+            WHERE list_id IS DISTINCT FROM {SKIPPED_LIST_ID}
+        )"""
+
+    owner_list_ids = f"SELECT list_id FROM {deleted_tasks('old_tasks')} AS deleted"
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION task_delete_tombstones() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO tombstone (id, kind, user_id, family_id, deleted_at)
+            SELECT deleted_tasks.id, 'task', list.user_id, list.family_id,
+                   now() AT TIME ZONE 'UTC'
+            FROM {deleted_tasks("old_rows")} AS deleted_tasks
+            JOIN list ON list.id = deleted_tasks.list_id
+            ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+            RETURN NULL;
+        END;
+        $$
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION task_delete_owner_versions()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM bump_owner_versions(
+                ARRAY(SELECT DISTINCT user_id FROM list
+                      WHERE id IN ({owner_list_ids}) AND user_id IS NOT NULL),
+                ARRAY(SELECT DISTINCT family_id FROM list
+                      WHERE id IN ({owner_list_ids}) AND family_id IS NOT NULL),
+                'task.delete'
+            );
+            RETURN NULL;
+        END;
+        $$
+        """,
+    ]
+
+
+def upgrade():
+    for function in trigger_functions(skip_list_delete=True):
+        op.execute(function)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_task_user_id"),
+            "task",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_task_user_id"), table_name="task", postgresql_concurrently=True
+        )
+
+    for function in trigger_functions(skip_list_delete=False):
+        op.execute(function)
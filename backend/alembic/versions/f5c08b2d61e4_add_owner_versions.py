@@ -0,0 +1,158 @@
+"""add owner versions
+
+Revision ID: f5c08b2d61e4
+Revises: e2a94c7f3d18
+Create Date: 2026-10-18 15:02:47.381920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "f5c08b2d61e4"
+down_revision = "e2a94c7f3d18"
+branch_labels = None
+depends_on = None
+
+
+# family.version and user.version are bumped whenever a list they own, or a
+# task in such a list, is written. Task and list inserts and deletes use
+# statement-level triggers over the transition tables, so bulk writes and
+# cascades bump each owner once per statement. List updates use a row-level
+# trigger that ignores the open_count/completed_count updates made by the task
+# counter triggers, since the task triggers already bump the owner for those.
+TASK_LIST_IDS = {
+    "insert": "SELECT list_id FROM new_tasks",
+    "delete": "SELECT list_id FROM old_tasks",
+    "update": "SELECT list_id FROM new_tasks UNION SELECT list_id FROM old_tasks",
+}
+TASK_TRANSITION_TABLES = {
+    "insert": "NEW TABLE AS new_tasks",
+    "delete": "OLD TABLE AS old_tasks",
+    "update": "OLD TABLE AS old_tasks NEW TABLE AS new_tasks",
+}
+LIST_TRANSITION_TABLES = {
+    "insert": ("NEW TABLE AS changed_lists", "changed_lists"),
+    "delete": ("OLD TABLE AS changed_lists", "changed_lists"),
+}
+
+
+def upgrade():
+    op.add_column(
+        "family",
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "user",
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION bump_owner_versions(user_ids uuid[], family_ids uuid[])
+        RETURNS void LANGUAGE sql AS $$
+            UPDATE family SET version = version + 1 WHERE id = ANY(family_ids);
+            UPDATE "user" SET version = version + 1 WHERE id = ANY(user_ids);
+        $$
+        """
+    )
+
+    for operation, list_ids in TASK_LIST_IDS.items():
+        op.execute(
+            f"""
+            CREATE FUNCTION task_{operation}_owner_versions() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                PERFORM bump_owner_versions(
+                    ARRAY(SELECT DISTINCT user_id FROM list
+                          WHERE id IN ({list_ids}) AND user_id IS NOT NULL),
+                    ARRAY(SELECT DISTINCT family_id FROM list
+                          WHERE id IN ({list_ids}) AND family_id IS NOT NULL)
+                );
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER task_{operation}_owner_versions
+            AFTER {operation.upper()} ON task
+            REFERENCING {TASK_TRANSITION_TABLES[operation]}
+            FOR EACH STATEMENT EXECUTE FUNCTION task_{operation}_owner_versions()
+            """
+        )
+
+    for operation, (transition_table, name) in LIST_TRANSITION_TABLES.items():
+        op.execute(
+            f"""
+            CREATE FUNCTION list_{operation}_owner_versions() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                PERFORM bump_owner_versions(
+                    ARRAY(SELECT DISTINCT user_id FROM {name}
+                          WHERE user_id IS NOT NULL),
+                    ARRAY(SELECT DISTINCT family_id FROM {name}
+                          WHERE family_id IS NOT NULL)
+                );
+                RETURN NULL;
+            END;
+            $$
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER list_{operation}_owner_versions
+            AFTER {operation.upper()} ON list
+            REFERENCING {transition_table}
+            FOR EACH STATEMENT EXECUTE FUNCTION list_{operation}_owner_versions()
+            """
+        )
+
+    op.execute(
+        """
+        CREATE FUNCTION list_update_owner_versions() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM bump_owner_versions(
+                ARRAY(SELECT DISTINCT user_id
+                      FROM (VALUES (OLD.user_id), (NEW.user_id)) AS ids(user_id)
+                      WHERE user_id IS NOT NULL),
+                ARRAY(SELECT DISTINCT family_id
+                      FROM (VALUES (OLD.family_id), (NEW.family_id)) AS ids(family_id)
+                      WHERE family_id IS NOT NULL)
+            );
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER list_update_owner_versions
+        AFTER UPDATE OF name, color, is_family_list, user_id, family_id ON list
+        FOR EACH ROW
+        WHEN (
+            (OLD.name, OLD.color, OLD.is_family_list, OLD.user_id, OLD.family_id)
+            IS DISTINCT FROM
+            (NEW.name, NEW.color, NEW.is_family_list, NEW.user_id, NEW.family_id)
+        )
+        EXECUTE FUNCTION list_update_owner_versions()
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER list_update_owner_versions ON list")
+    op.execute("DROP FUNCTION list_update_owner_versions()")
+    for operation in LIST_TRANSITION_TABLES:
+        op.execute(f"DROP TRIGGER list_{operation}_owner_versions ON list")
+        op.execute(f"DROP FUNCTION list_{operation}_owner_versions()")
+    for operation in TASK_LIST_IDS:
+        op.execute(f"DROP TRIGGER task_{operation}_owner_versions ON task")
+        op.execute(f"DROP FUNCTION task_{operation}_owner_versions()")
+    op.execute("DROP FUNCTION bump_owner_versions(uuid[], uuid[])")
+    op.drop_column("user", "version")
+    op.drop_column("family", "version")
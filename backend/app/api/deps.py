@@ -1,17 +1,27 @@
-from collections.abc import Generator
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from datetime import datetime, timedelta
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
-from app.core import crud, security
-from app.core.db import engine
-from app.core.models import TokenPayload, User
+from app.core import crud_async, security
+from app.core.cache import principal_cache, response_cache
+from app.core.db import async_engine, engine
+from app.core.models import Cursor, TokenPayload, User
+from app.core.utils import (
+    decode_cursor,
+    decode_sync_token,
+    etag_matches,
+    make_etag,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_STR}/login/access-token")
 
@@ -25,13 +35,129 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
-SessionDep = Annotated[Session, Depends(get_db)]
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Generates a new async database session for dependency injection.
+
+    Objects are not expired on commit, since reloading an expired attribute
+    would need IO outside of AsyncSession.run_sync.
+    """
+
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+SessionDep = Annotated[
+    Session | AsyncSession,
+    Depends(get_async_db if settings.DATABASE_ASYNC else get_db),
+]
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def get_cursor(cursor: str | None = None) -> Cursor | None:
+    """
+    Decodes the opaque keyset pagination cursor passed as a query parameter.
+    """
+
+    if cursor is None:
+        return None
+
+    try:
+        created_at, id = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return Cursor(created_at=created_at, id=id)
+
+
+CursorDep = Annotated[Cursor | None, Depends(get_cursor)]
+
+
+def get_since(since: str | None = None) -> datetime | None:
+    """
+    Decodes the opaque sync token passed as a query parameter.
+    """
+
+    if since is None:
+        return None
+
+    try:
+        since_time = decode_sync_token(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+    retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    if since_time < datetime.utcnow() - retention:
+        raise HTTPException(
+            status_code=410, detail="Sync token expired, sync from scratch"
+        )
+
+    return since_time
+
+
+SinceDep = Annotated[datetime | None, Depends(get_since)]
+
+
+def not_modified(
+    request: Request, response: Response, version: int, owner_id: uuid.UUID | None
+) -> Response | None:
+    """
+    Sets an ETag derived from the owner's version and the request URL on the
+    response. Returns a 304 response if the client already holds that version.
+    """
+
+    etag = make_etag(version, owner_id, request.url.path, request.url.query)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def encoded_response(response: Response, body: bytes) -> Response:
+    """
+    Returns an already encoded JSON body with the headers set on response.
+    """
+
+    encoded = Response(content=body, media_type="application/json")
+    encoded.raw_headers.extend(response.raw_headers)
+    return encoded
+
+
+def json_response(response: Response, model: SQLModel) -> Response:
+    """
+    Encodes model, as built from the objects read, straight to JSON. FastAPI
+    neither validates a returned Response against the route's response_model
+    nor encodes it again, so model must already have the response_model type.
+    """
+
+    return encoded_response(response, model.model_dump_json().encode())
+
+
+async def cached_json(
+    response: Response, read: Callable[[], Awaitable[SQLModel]]
+) -> Response:
+    """
+    Serves the encoded result of read from the response cache, keyed by the
+    ETag that not_modified set on response, or encodes it without a response
+    cache.
+    """
+
+    if response_cache is None:
+        return json_response(response, await read())
+
+    etag = response.headers["etag"]
+    body = await response_cache.get(etag)
+    if body is None:
+        body = (await read()).model_dump_json().encode()
+        await response_cache.set(etag, body)
+    return encoded_response(response, body)
+
+
+async def get_current_user(session: SessionDep, token: TokenDep) -> User:
     """
     Retrieves the current authenticated user based on the provided JWT token.
+    The user is served from the principal cache when possible.
     """
 
     try:
@@ -39,24 +165,30 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
         token_data = TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
+        user_id = uuid.UUID(token_data.sub)
+    except (InvalidTokenError, ValidationError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user_id = token_data.sub
-    user = crud.read_user_by_id(session=session, id=user_id)
+
+    user_data = principal_cache.get(user_id)
+    if user_data is not None:
+        return await crud_async.attach_cached_user(session=session, user_data=user_data)
+
+    user = await crud_async.read_user_by_id(session=session, id=user_id)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    principal_cache.set(user.id, user.model_dump())
     return user
 
 
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
 
 
-def get_current_admin(
+async def get_current_admin(
     current_user: CurrentUserDep,
 ):
     """
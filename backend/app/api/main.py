@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import families, lists, login, ping, tasks, users
+from app.api.routes import families, lists, login, ping, sync, tasks, users
 
 api_router = APIRouter()
 api_router.include_router(ping.router, prefix="/ping", tags=["ping"])
@@ -9,3 +9,4 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(families.router, prefix="/families", tags=["families"])
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(lists.router, prefix="/lists", tags=["lists"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
@@ -1,18 +1,39 @@
+import asyncio
+import contextlib
+import json
 import uuid
+from collections.abc import AsyncGenerator
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CurrentUserDep, CursorDep, SessionDep, json_response
 from app.config import settings
-from app.core import crud
-from app.core.models import FamilyPublic, ListCreate, UsersPublic
+from app.core import crud_async
+from app.core.events import FamilyEventBroker, family_events
+from app.core.models import FamilyPublic, ListCreate, User, UsersPublic
 
 router = APIRouter()
 
 
+def check_family_member(current_user: User, family_id: uuid.UUID, what: str) -> None:
+    """
+    Checks that the current user belongs to the family, raising an exception
+    if not.
+    """
+
+    if family_id != current_user.family_id:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Not enough permissions to access another family's {what}.",
+        )
+
+
 @router.post("/", response_model=FamilyPublic)
-def create_family(session: SessionDep, current_user: CurrentUserDep, name: str) -> Any:
+async def create_family(
+    session: SessionDep, current_user: CurrentUserDep, name: str
+) -> Any:
     """
     Create new family.
     """
@@ -20,26 +41,19 @@ def create_family(session: SessionDep, current_user: CurrentUserDep, name: str)
     if current_user.family_id:
         raise HTTPException(status_code=403, detail="User is already part of a family")
 
-    family = crud.create_family(session=session, name=name)
-    crud.join_family(session=session, db_user=current_user, family_id=family.id)
-    crud.promote_user_to_admin(session=session, db_user=current_user)
-
-    crud.create_list(
+    return await crud_async.create_family_with_admin(
         session=session,
-        list_in=ListCreate(name=settings.DEFAULT_FAMILY_LIST, is_family_list=True),
-        relationship_data={"family_id": current_user.family_id},
+        db_user=current_user,
+        name=name,
+        family_list_in=ListCreate(
+            name=settings.DEFAULT_FAMILY_LIST, is_family_list=True
+        ),
+        personal_list_in=ListCreate(name=settings.DEFAULT_PERSONAL_LIST),
     )
-    crud.create_list(
-        session=session,
-        list_in=ListCreate(name=settings.DEFAULT_PERSONAL_LIST),
-        relationship_data={"user_id": current_user.id},
-    )
-
-    return family
 
 
 @router.post("/join", response_model=FamilyPublic)
-def join_family(
+async def join_family(
     session: SessionDep, current_user: CurrentUserDep, invite_code: str
 ) -> Any:
     """
@@ -49,50 +63,120 @@ def join_family(
     if current_user.family_id:
         raise HTTPException(status_code=403, detail="User is already part of a family")
 
-    family = crud.read_family_by_invite_code(session=session, invite_code=invite_code)
-    crud.join_family(session=session, db_user=current_user, family_id=family.id)
+    family = await crud_async.read_family_by_invite_code(
+        session=session, invite_code=invite_code
+    )
+    if not family:
+        raise HTTPException(status_code=404, detail="Family not found")
 
-    crud.create_list(
+    return await crud_async.join_family_with_list(
         session=session,
-        list_in=ListCreate(name=settings.DEFAULT_PERSONAL_LIST),
-        relationship_data={"user_id": current_user.id},
+        db_user=current_user,
+        db_family=family,
+        personal_list_in=ListCreate(name=settings.DEFAULT_PERSONAL_LIST),
     )
 
-    return family
-
 
 @router.get(
     "/{family_id}/members",
     response_model=UsersPublic,
 )
-def read_family_members(
-    session: SessionDep, current_user: CurrentUserDep, family_id: uuid.UUID
+async def read_family_members(
+    response: Response,
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    family_id: uuid.UUID,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    with_count: bool = True,
 ) -> Any:
     """
-    Reads family members.
+    Reads family members. With `with_count=false` the total `count` is
+    skipped and `has_more` tells whether there is a next page.
     """
-    if family_id != current_user.family_id:
-        raise HTTPException(
-            status_code=403,
-            detail="Not enough permissions to access another family's members.",
-        )
 
-    return crud.read_family_members(session=session, family_id=family_id)
+    check_family_member(current_user, family_id, "members")
+
+    members = await crud_async.read_family_members(
+        session=session,
+        family_id=family_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_count=with_count,
+    )
+    return json_response(response, members)
 
 
 @router.get("/{family_id}/invite-code", response_model=str)
-def read_family_invite_code(
+async def read_family_invite_code(
     session: SessionDep, current_user: CurrentUserDep, family_id: uuid.UUID
 ) -> Any:
     """
     Reads family invite code.
     """
 
-    if family_id != current_user.family_id:
-        raise HTTPException(
-            status_code=403,
-            detail="Not enough permissions to access another family's invite code.",
-        )
+    check_family_member(current_user, family_id, "invite code")
 
-    family = crud.read_family_by_id(session=session, id=family_id)
+    family = await crud_async.read_family_by_id(session=session, id=family_id)
     return family.invite_code
+
+
+async def stream_family_events(
+    broker: FamilyEventBroker, family_id: uuid.UUID
+) -> AsyncGenerator[str, None]:
+    """
+    Formats the family's events as server-sent events. A ready event is sent
+    once the subscription is live; clients should refetch after it.
+    """
+
+    async with broker.subscribe(family_id) as queue:
+        yield "event: ready\ndata: {}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), settings.FAMILY_EVENTS_HEARTBEAT_SECONDS
+                )
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def resume_stream(
+    first: str, stream: AsyncGenerator[str, None]
+) -> AsyncGenerator[str, None]:
+    """
+    Yields first, then the rest of stream, closing it when done.
+    """
+
+    async with contextlib.aclosing(stream):
+        yield first
+        async for message in stream:
+            yield message
+
+
+@router.get("/{family_id}/events", response_class=StreamingResponse)
+async def read_family_events(current_user: CurrentUserDep, family_id: uuid.UUID) -> Any:
+    """
+    Streams task and list change events of the family as server-sent events.
+    """
+
+    check_family_member(current_user, family_id, "events")
+
+    # Subscribe before the response starts, so an unreachable database can
+    # still be answered with a 503
+    stream = stream_family_events(family_events, family_id)
+    try:
+        ready = await anext(stream)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=503, detail="Family events are unavailable, try again later."
+        ) from None
+
+    return StreamingResponse(
+        resume_stream(ready, stream),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
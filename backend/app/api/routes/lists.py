@@ -1,10 +1,18 @@
+import functools
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 
-from app.api.deps import CurrentUserDep, SessionDep
-from app.core import crud
+from app.api.deps import (
+    CurrentUserDep,
+    CursorDep,
+    SessionDep,
+    cached_json,
+    not_modified,
+)
+from app.config import settings
+from app.core import crud_async
 from app.core.models import (
     List,
     ListCreate,
@@ -18,36 +26,93 @@ router = APIRouter()
 
 
 @router.get("/personal", response_model=ListsPublic)
-def read_personal_lists(session: SessionDep, current_user: CurrentUserDep) -> Any:
+async def read_personal_lists(
+    request: Request,
+    response: Response,
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    with_count: bool = True,
+) -> Any:
     """
-    Retrieve personal lists.
+    Retrieve personal lists. Answers 304 if `If-None-Match` holds the current
+    ETag. With `with_count=false` the total `count` is skipped and `has_more`
+    tells whether there is a next page.
     """
 
-    return crud.read_personal_lists(session=session, user_id=current_user.id)
+    version = await crud_async.read_user_version(session=session, id=current_user.id)
+    if cached := not_modified(request, response, version, current_user.id):
+        return cached
+
+    return await cached_json(
+        response,
+        functools.partial(
+            crud_async.read_personal_lists,
+            session=session,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_count=with_count,
+        ),
+    )
 
 
 @router.get("/family", response_model=ListsPublic)
-def read_family_lists(session: SessionDep, current_user: CurrentUserDep) -> Any:
+async def read_family_lists(
+    request: Request,
+    response: Response,
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    with_count: bool = True,
+) -> Any:
     """
-    Retrieve family lists.
+    Retrieve family lists. Answers 304 if `If-None-Match` holds the current
+    ETag. With `with_count=false` the total `count` is skipped and `has_more`
+    tells whether there is a next page. A user without a family has none.
     """
 
-    return crud.read_family_lists(session=session, family_id=current_user.family_id)
+    if current_user.family_id is None:
+        return ListsPublic(data=[], count=0 if with_count else None)
+
+    version = await crud_async.read_family_version(
+        session=session, id=current_user.family_id
+    )
+    if cached := not_modified(request, response, version, current_user.family_id):
+        return cached
+
+    return await cached_json(
+        response,
+        functools.partial(
+            crud_async.read_family_lists,
+            session=session,
+            family_id=current_user.family_id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_count=with_count,
+        ),
+    )
 
 
 @router.get("/{list_id}", response_model=List)
-def read_list(
+async def read_list(
     session: SessionDep, current_user: CurrentUserDep, list_id: uuid.UUID
 ) -> Any:
     """
     Retrieve list.
     """
 
-    return crud.read_list_by_id(session=session, id=list_id)
+    return await crud_async.read_list_by_id(session=session, id=list_id)
 
 
 @router.post("/", response_model=ListPublic)
-def create_list(
+async def create_list(
     session: SessionDep, current_user: CurrentUserDep, list_in: ListCreate
 ) -> Any:
     """
@@ -60,19 +125,19 @@ def create_list(
                 status_code=403,
                 detail="Not enough permissions to create a family list.",
             )
-        return crud.create_list(
+        return await crud_async.create_list(
             session=session,
             list_in=list_in,
             relationship_data={"family_id": current_user.family_id},
         )
 
-    return crud.create_list(
+    return await crud_async.create_list(
         session=session, list_in=list_in, relationship_data={"user_id": current_user.id}
     )
 
 
 @router.patch("/{list_id}", response_model=ListPublic)
-def update_list(
+async def update_list(
     session: SessionDep,
     current_user: CurrentUserDep,
     list_id: uuid.UUID,
@@ -82,7 +147,7 @@ def update_list(
     Update list.
     """
 
-    db_list = crud.read_list_by_id(session=session, id=list_id)
+    db_list = await crud_async.read_list_by_id(session=session, id=list_id)
     if not db_list:
         raise HTTPException(status_code=404, detail="List not found")
 
@@ -99,7 +164,9 @@ def update_list(
                 detail="Not enough permissions to update someone else's family list.",
             )
 
-        return crud.update_list(session=session, db_list=db_list, list_in=list_in)
+        return await crud_async.update_list(
+            session=session, db_list=db_list, list_in=list_in
+        )
 
     if db_list.user_id != current_user.id:
         raise HTTPException(
@@ -107,18 +174,20 @@ def update_list(
             detail="Not enough permissions to update someone else's the list.",
         )
 
-    return crud.update_list(session=session, db_list=db_list, list_in=list_in)
+    return await crud_async.update_list(
+        session=session, db_list=db_list, list_in=list_in
+    )
 
 
 @router.delete("/{list_id}", response_model=Message)
-def delete_list(
+async def delete_list(
     session: SessionDep, current_user: CurrentUserDep, list_id: uuid.UUID
 ) -> Any:
     """
     Delete list
     """
 
-    db_list = session.get(List, list_id)
+    db_list = await crud_async.read_list_by_id(session=session, id=list_id)
 
     if not db_list:
         raise HTTPException(status_code=404, detail="List not found")
@@ -136,7 +205,11 @@ def delete_list(
                 detail="Not enough permissions to delete someone else's family list.",
             )
 
-        crud.delete_list(session=session, db_list=db_list)
+        await crud_async.delete_list(
+            session=session,
+            db_list=db_list,
+            batch_size=settings.LIST_DELETE_BATCH_SIZE,
+        )
         return Message(message="Task deleted successfully")
 
     if db_list.user_id != current_user.id:
@@ -145,5 +218,9 @@ def delete_list(
             detail="Not enough permissions to delete someone else's the list.",
         )
 
-    crud.delete_list(session=session, db_list=db_list)
+    await crud_async.delete_list(
+        session=session,
+        db_list=db_list,
+        batch_size=settings.LIST_DELETE_BATCH_SIZE,
+    )
     return Message(message="Task deleted successfully")
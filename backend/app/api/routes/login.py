@@ -6,23 +6,30 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from app.api.deps import CurrentUserDep, SessionDep
 from app.config import settings
-from app.core import crud, security
+from app.core import crud_async, security
 from app.core.models import Token, UserPublic
 
 router = APIRouter()
 
 
 @router.post("/login/access-token")
-def login_access_token(
+async def login_access_token(
     session: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Token:
     """
     Authenticates a user and returns an access token if credentials are correct.
     """
 
-    user = crud.authenticate(
-        session=session, email=form_data.username, password=form_data.password
-    )
+    try:
+        user = await crud_async.authenticate(
+            session=session, email=form_data.username, password=form_data.password
+        )
+    except security.PasswordHasherBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many login attempts in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -34,7 +41,7 @@ def login_access_token(
 
 
 @router.post("/login/test-token", response_model=UserPublic)
-def test_token(current_user: CurrentUserDep) -> Any:
+async def test_token(current_user: CurrentUserDep) -> Any:
     """
     Test access token
     """
@@ -0,0 +1,45 @@
+"""Exposes the Prometheus metrics of all workers."""
+
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.config import settings
+from app.core.metrics import render_metrics
+
+router = APIRouter()
+
+bearer = HTTPBearer(auto_error=False)
+
+
+def check_metrics_token(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer)],
+) -> None:
+    """
+    Checks the bearer token of a scrape against METRICS_TOKEN. Without a
+    token configured, the metrics are only served in local.
+    """
+
+    if not settings.METRICS_TOKEN:
+        if settings.ENVIRONMENT != "local":
+            raise HTTPException(status_code=404, detail="Not Found")
+        return
+
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get(
+    "/metrics", include_in_schema=False, dependencies=[Depends(check_metrics_token)]
+)
+def metrics() -> Response:
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
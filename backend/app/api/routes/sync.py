@@ -0,0 +1,31 @@
+from typing import Any
+
+from fastapi import APIRouter, Response
+
+from app.api.deps import CurrentUserDep, SessionDep, SinceDep, json_response
+from app.core import crud_async
+from app.core.models import Changes
+
+router = APIRouter()
+
+
+@router.get("/", response_model=Changes)
+async def read_changes(
+    response: Response,
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    since: SinceDep,
+) -> Any:
+    """
+    Retrieve the personal and family lists and tasks changed since the `since`
+    token, and the ids of those deleted. Without a token everything is
+    returned. Pass the returned `token` as `since` to fetch the next changes.
+    """
+
+    changes = await crud_async.read_changes(
+        session=session,
+        user_id=current_user.id,
+        family_id=current_user.family_id,
+        since=since,
+    )
+    return json_response(response, changes)
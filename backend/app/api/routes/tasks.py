@@ -1,87 +1,170 @@
+import functools
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 
-from app.api.deps import CurrentUserDep, SessionDep
-from app.core import crud
+from app.api.deps import (
+    CurrentUserDep,
+    CursorDep,
+    SessionDep,
+    cached_json,
+    json_response,
+    not_modified,
+)
+from app.config import settings
+from app.core import crud_async
 from app.core.models import (
+    ArchivedTasksPublic,
+    List,
     Message,
+    TaskBulkResult,
     TaskCreate,
+    TaskIds,
     TaskPublic,
+    TasksBulkResult,
     TasksPublic,
+    TasksStatusUpdate,
     TaskUpdate,
+    User,
 )
 
 router = APIRouter()
 
 
-@router.get("/{list_id}", response_model=TasksPublic)
-def read_tasks(
-    session: SessionDep,
-    current_user: CurrentUserDep,
-    list_id: uuid.UUID,
-    skip: int = 0,
-    limit: int = 100,
-) -> Any:
+def check_list_tasks_access(
+    current_user: User, db_list: List | None, action: str
+) -> None:
     """
-    Retrieve tasks.
+    Checks that db_list exists and that the current user may act on its
+    tasks, raising an exception if not.
     """
 
-    db_list = crud.read_list_by_id(session=session, id=list_id)
-
     if not db_list:
         raise HTTPException(status_code=404, detail="List not found")
 
     if db_list.family_id and current_user.family_id != db_list.family_id:
         raise HTTPException(
             status_code=403,
-            detail="Not enough permissions to read another family's tasks",
+            detail=f"Not enough permissions to {action} another family's tasks",
         )
 
     if db_list.user_id and current_user.id != db_list.user_id:
         raise HTTPException(
             status_code=403,
-            detail="Not enough permissions to read another users's tasks",
+            detail=f"Not enough permissions to {action} another users's tasks",
         )
 
-    return crud.read_list_tasks(
-        session=session, list_id=list_id, skip=skip, limit=limit
+
+@router.get("/{list_id}", response_model=TasksPublic)
+async def read_tasks(
+    request: Request,
+    response: Response,
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    list_id: uuid.UUID,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    with_count: bool = True,
+) -> Any:
+    """
+    Retrieve tasks. Pass the returned `next_cursor` as `cursor` to fetch the
+    next page; with `with_count=false` the total `count` is skipped and
+    `has_more` tells whether there is one. Answers 304 if `If-None-Match`
+    holds the current ETag.
+    """
+
+    db_list = await crud_async.read_list_by_id(session=session, id=list_id)
+    check_list_tasks_access(current_user, db_list, "read")
+
+    if db_list.family_id:
+        version = await crud_async.read_family_version(
+            session=session, id=db_list.family_id
+        )
+    else:
+        version = await crud_async.read_user_version(
+            session=session, id=db_list.user_id
+        )
+    if cached := not_modified(
+        request, response, version, db_list.family_id or db_list.user_id
+    ):
+        return cached
+
+    return await cached_json(
+        response,
+        functools.partial(
+            crud_async.read_list_tasks,
+            session=session,
+            list_id=list_id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_count=with_count,
+        ),
     )
 
 
-@router.post("/", response_model=TaskPublic)
-def create_task(
-    session: SessionDep, current_user: CurrentUserDep, task_in: TaskCreate
+@router.get("/{list_id}/archive", response_model=ArchivedTasksPublic)
+async def read_archived_tasks(
+    response: Response,
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    list_id: uuid.UUID,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    with_count: bool = True,
 ) -> Any:
     """
-    Create new task.
+    Retrieve the archived tasks of a list, the completed tasks that were
+    cleared or aged out, newest first.
     """
-    db_list = crud.read_list_by_id(session=session, id=task_in.list_id)
 
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
+    db_list = await crud_async.read_list_by_id(session=session, id=list_id)
+    check_list_tasks_access(current_user, db_list, "read")
+
+    archived = await crud_async.read_archived_tasks(
+        session=session,
+        list_id=list_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_count=with_count,
+    )
+    return json_response(response, archived)
+
+
+def check_create_task_permissions(
+    current_user: User, db_list: List, assignee_ids: set[uuid.UUID]
+) -> None:
+    """
+    Checks that the current user may create tasks assigned to assignee_ids in
+    db_list, raising an exception if not.
+    """
 
     # Family list
     if db_list.is_family_list:
         if current_user.family_id != db_list.family_id:
             raise HTTPException(
                 status_code=403,
-                detail="Not enough permissions to create a task in another family's list",
+                detail=(
+                    "Not enough permissions to create a task in another family's list"
+                ),
             )
 
         # Admins can assign tasks to anyone (including themselves)
         if current_user.is_admin:
-            return crud.create_task(session=session, task_in=task_in)
+            return
 
         # Regular users can only create tasks for themselves
-        if current_user.id != task_in.user_id:
+        if assignee_ids != {current_user.id}:
             raise HTTPException(
                 status_code=403,
                 detail="Not enough permissions to assign tasks to others",
             )
 
-        return crud.create_task(session=session, task_in=task_in)
+        return
 
     # Personal list
     # Tasks must always belong to the list owner
@@ -91,11 +174,145 @@ def create_task(
             detail="Not enough permissions to create tasks in another user's list",
         )
 
-    return crud.create_task(session=session, task_in=task_in)
+
+@router.post("/", response_model=TaskPublic)
+async def create_task(
+    session: SessionDep, current_user: CurrentUserDep, task_in: TaskCreate
+) -> Any:
+    """
+    Create new task.
+    """
+    db_list = await crud_async.read_list_by_id(session=session, id=task_in.list_id)
+
+    if not db_list:
+        raise HTTPException(status_code=404, detail="List not found")
+
+    check_create_task_permissions(current_user, db_list, {task_in.user_id})
+
+    return await crud_async.create_task(session=session, task_in=task_in)
+
+
+@router.post("/batch", response_model=list[TaskPublic])
+async def create_tasks(
+    session: SessionDep, current_user: CurrentUserDep, tasks_in: list[TaskCreate]
+) -> Any:
+    """
+    Create many tasks in one list at once.
+    """
+
+    if not tasks_in:
+        raise HTTPException(status_code=400, detail="No tasks to create")
+
+    if len(tasks_in) > settings.TASK_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Cannot create more than {settings.TASK_BATCH_MAX_SIZE} tasks at once"
+            ),
+        )
+
+    list_ids = {task_in.list_id for task_in in tasks_in}
+    if len(list_ids) != 1:
+        raise HTTPException(
+            status_code=400, detail="All tasks must belong to the same list"
+        )
+
+    db_list = await crud_async.read_list_by_id(session=session, id=list_ids.pop())
+
+    if not db_list:
+        raise HTTPException(status_code=404, detail="List not found")
+
+    check_create_task_permissions(
+        current_user, db_list, {task_in.user_id for task_in in tasks_in}
+    )
+
+    return await crud_async.create_tasks(session=session, tasks_in=tasks_in)
+
+
+@router.patch("/status", response_model=TasksBulkResult)
+async def update_tasks_status(
+    session: SessionDep, current_user: CurrentUserDep, tasks_in: TasksStatusUpdate
+) -> Any:
+    """
+    Update the status of many tasks. Only the current user's own tasks are
+    updated, the outcome is reported per task id.
+    """
+
+    ids = list(dict.fromkeys(tasks_in.ids))
+    if len(ids) > settings.TASK_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Cannot update more than {settings.TASK_BATCH_MAX_SIZE} tasks at once"
+            ),
+        )
+
+    tasks = await crud_async.read_tasks_by_ids(
+        session=session, ids=ids, for_update=True
+    )
+    owners = {task.id: task.user_id for task in tasks}
+    results = []
+    for id in ids:
+        if id not in owners:
+            results.append(TaskBulkResult(id=id, status="not_found"))
+        elif owners[id] != current_user.id:
+            results.append(TaskBulkResult(id=id, status="forbidden"))
+        else:
+            results.append(TaskBulkResult(id=id, status="updated"))
+
+    await crud_async.update_tasks_status(
+        session=session,
+        ids=[result.id for result in results if result.status == "updated"],
+        completed=tasks_in.completed,
+    )
+
+    return TasksBulkResult(data=results)
+
+
+@router.delete("/", response_model=TasksBulkResult)
+async def delete_tasks(
+    session: SessionDep, current_user: CurrentUserDep, tasks_in: TaskIds
+) -> Any:
+    """
+    Delete many tasks. Only the current user's own completed tasks are
+    deleted, the outcome is reported per task id.
+    """
+
+    ids = list(dict.fromkeys(tasks_in.ids))
+    if len(ids) > settings.TASK_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Cannot delete more than {settings.TASK_BATCH_MAX_SIZE} tasks at once"
+            ),
+        )
+
+    tasks = await crud_async.read_tasks_by_ids(
+        session=session, ids=ids, for_update=True
+    )
+    tasks_by_id = {task.id: task for task in tasks}
+    results = []
+    for id in ids:
+        task = tasks_by_id.get(id)
+        if not task:
+            results.append(TaskBulkResult(id=id, status="not_found"))
+        elif not task.completed:
+            results.append(TaskBulkResult(id=id, status="incomplete"))
+        elif task.user_id != current_user.id:
+            results.append(TaskBulkResult(id=id, status="forbidden"))
+        else:
+            results.append(TaskBulkResult(id=id, status="deleted"))
+
+    await crud_async.delete_tasks(
+        session=session,
+        ids=[result.id for result in results if result.status == "deleted"],
+    )
+
+    return TasksBulkResult(data=results)
 
 
 @router.patch("/{task_id}", response_model=TaskPublic)
-def update_task(
+async def update_task(
     session: SessionDep,
     current_user: CurrentUserDep,
     task_id: uuid.UUID,
@@ -105,7 +322,7 @@ def update_task(
     Update task.
     """
 
-    task = crud.read_task_by_id(session=session, id=task_id)
+    task = await crud_async.read_task_by_id(session=session, id=task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -116,7 +333,7 @@ def update_task(
                 detail="Not enough permissions to update another user's task",
             )
 
-        db_list = crud.read_list_by_id(session=session, id=task.list_id)
+        db_list = await crud_async.read_list_by_id(session=session, id=task.list_id)
 
         if db_list.family_id != current_user.family_id:
             raise HTTPException(
@@ -124,11 +341,11 @@ def update_task(
                 detail="Not enough permissions to update someone else's family task.",
             )
 
-    return crud.update_task(session=session, db_task=task, task_in=task_in)
+    return await crud_async.update_task(session=session, db_task=task, task_in=task_in)
 
 
 @router.patch("/{task_id}/status", response_model=TaskPublic)
-def update_task_status(
+async def update_task_status(
     session: SessionDep,
     current_user: CurrentUserDep,
     task_id: uuid.UUID,
@@ -138,7 +355,7 @@ def update_task_status(
     Update task status.
     """
 
-    task = crud.read_task_by_id(session=session, id=task_id)
+    task = await crud_async.read_task_by_id(session=session, id=task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -148,48 +365,37 @@ def update_task_status(
             detail="Not enough permissions to complete another user's task",
         )
 
-    return crud.update_task_status(session=session, db_task=task, completed=completed)
+    return await crud_async.update_task_status(
+        session=session, db_task=task, completed=completed
+    )
 
 
 @router.delete("clear/{list_id}", response_model=Message)
-def clear_tasks(
+async def clear_tasks(
     session: SessionDep, current_user: CurrentUserDep, list_id: uuid.UUID
 ) -> Any:
     """
-    Clears a lists tasks. Only completed tasks will get cleared.
+    Clears a lists tasks. Only completed tasks will get cleared, they are
+    moved to the list's archive.
     """
 
-    db_list = crud.read_list_by_id(session=session, id=list_id)
-
-    if not db_list:
-        raise HTTPException(status_code=404, detail="List not found")
-
-    if db_list.family_id and current_user.family_id != db_list.family_id:
-        raise HTTPException(
-            status_code=403,
-            detail="Not enough permissions to clear another family's tasks",
-        )
-
-    if db_list.user_id and current_user.id != db_list.user_id:
-        raise HTTPException(
-            status_code=403,
-            detail="Not enough permissions to clear another users's tasks",
-        )
+    db_list = await crud_async.read_list_by_id(session=session, id=list_id)
+    check_list_tasks_access(current_user, db_list, "clear")
 
-    crud.clear_list_tasks(session=session, list_id=list_id)
+    await crud_async.clear_list_tasks(session=session, list_id=list_id)
 
     return Message(message="Task deleted successfully")
 
 
 @router.delete("/{task_id}", response_model=Message)
-def delete_task(
+async def delete_task(
     session: SessionDep, current_user: CurrentUserDep, task_id: uuid.UUID
 ) -> Any:
     """
     Delete task
     """
 
-    task = crud.read_task_by_id(session=session, id=task_id)
+    task = await crud_async.read_task_by_id(session=session, id=task_id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -203,6 +409,6 @@ def delete_task(
             detail="Not enough permissions to complete another user's task",
         )
 
-    crud.delete_task(session=session, db_task=task)
+    await crud_async.delete_task(session=session, db_task=task)
 
     return Message(message="Task deleted successfully")
@@ -4,14 +4,14 @@ from typing import Any
 from fastapi import APIRouter, HTTPException
 
 from app.api.deps import CurrentAdminDep, CurrentUserDep, SessionDep
-from app.core import crud
+from app.core import crud_async, security
 from app.core.models import Message, UserCreate, UserPublic
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserPublic)
-def read_user_me(current_user: CurrentUserDep) -> Any:
+async def read_user_me(current_user: CurrentUserDep) -> Any:
     """
     Retrieves the current authenticated user's information.
     """
@@ -20,12 +20,12 @@ def read_user_me(current_user: CurrentUserDep) -> Any:
 
 
 @router.get("/{user_id}", response_model=UserPublic)
-def read_user(session: SessionDep, user_id: uuid.UUID) -> Any:
+async def read_user(session: SessionDep, user_id: uuid.UUID) -> Any:
     """
     Retrieves a user's information by id.
     """
 
-    db_user = crud.read_user_by_id(session=session, id=user_id)
+    db_user = await crud_async.read_user_by_id(session=session, id=user_id)
 
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -34,12 +34,12 @@ def read_user(session: SessionDep, user_id: uuid.UUID) -> Any:
 
 
 @router.post("/signup", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserCreate) -> Any:
+async def register_user(session: SessionDep, user_in: UserCreate) -> Any:
     """
     Create new user without the need to be logged in.
     """
 
-    user = crud.read_user_by_email(session=session, email=user_in.email)
+    user = await crud_async.read_user_by_email(session=session, email=user_in.email)
 
     if user:
         raise HTTPException(
@@ -49,18 +49,25 @@ def register_user(session: SessionDep, user_in: UserCreate) -> Any:
 
     user_create = UserCreate.model_validate(user_in)
 
-    return crud.create_user(session=session, user_create=user_create)
+    try:
+        return await crud_async.create_user(session=session, user_create=user_create)
+    except security.PasswordHasherBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many signups in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
 
 
 @router.post("/promote/{user_id}", response_model=Message)
-def promote_user(
+async def promote_user(
     session: SessionDep, current_admin: CurrentAdminDep, user_id: uuid.UUID
 ) -> Any:
     """
     Promotes a user to admin. The current admin gets demoted to regular user.
     """
 
-    db_user = crud.read_user_by_id(session=session, id=user_id)
+    db_user = await crud_async.read_user_by_id(session=session, id=user_id)
 
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -71,8 +78,8 @@ def promote_user(
             detail="Not enough permissions to promote another family's user",
         )
 
-    crud.promote_user_to_admin(session=session, db_user=db_user)
-
-    crud.demote_admin_to_user(session=session, db_admin_user=current_admin)
+    await crud_async.transfer_admin(
+        session=session, db_user=db_user, db_admin_user=current_admin
+    )
 
     return Message(message="User promoted to admin successfully")
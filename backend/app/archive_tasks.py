@@ -0,0 +1,31 @@
+import logging
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.config import settings
+from app.core import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    before = datetime.utcnow() - timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS)
+    logger.info("Archiving tasks completed before %s", before)
+    with Session(engine) as session:
+        created = crud.create_task_archive_partitions(
+            session=session,
+            before=before,
+            months_ahead=settings.TASK_ARCHIVE_PARTITIONS_AHEAD,
+        )
+        logger.info("Created %s task_archive partitions", created)
+        archived = crud.archive_completed_tasks(
+            session=session, before=before, batch_size=settings.TASK_ARCHIVE_BATCH_SIZE
+        )
+    logger.info("Archived %s tasks", archived)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import logging
+import sys
+
+from sqlmodel import Session
+
+from app.core import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def check(session: Session, repair: bool) -> int:
+    """
+    Logs every list whose task counters drifted from its tasks, repairing them
+    if asked to, and returns the number of drifted lists.
+    """
+
+    drift = crud.read_list_count_drift(session=session)
+    for row in drift:
+        logger.warning(
+            "List %s has open/completed counts %s/%s, expected %s/%s",
+            row.id,
+            row.open_count,
+            row.completed_count,
+            row.actual_open_count,
+            row.actual_completed_count,
+        )
+
+    if drift and repair:
+        crud.repair_list_counts(session=session, ids=[row.id for row in drift])
+        logger.info("Repaired %s lists", len(drift))
+
+    return len(drift)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Find lists whose task counters don't match their tasks."
+    )
+    parser.add_argument(
+        "--repair", action="store_true", help="recompute the drifted counters"
+    )
+    args = parser.parse_args()
+
+    logger.info("Checking list task counters")
+    with Session(engine) as session:
+        drifted = check(session, repair=args.repair)
+    logger.info("Found %s lists with drifted task counters", drifted)
+
+    if drifted and not args.repair:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
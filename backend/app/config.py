@@ -30,6 +30,42 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 1 days = 1 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 1
+    # bcrypt runs in a dedicated process pool; calls beyond the pending limit
+    # are rejected with 503 instead of queueing up behind each other
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # In-process cache of authenticated users, 0 disables it
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    # Opt-in cache of encoded list and task responses. "memory" keeps them in
+    # each worker up to RESPONSE_CACHE_MAX_BYTES; "redis" shares them through
+    # RESPONSE_CACHE_URL and needs the redis package installed.
+    RESPONSE_CACHE_BACKEND: Literal["none", "memory", "redis"] = "none"
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_URL: AnyUrl | None = None
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    # Events buffered per /families/{family_id}/events subscriber, the
+    # interval between keep-alive comments on an idle stream, and how long a
+    # new stream waits for the listener to connect before answering 503
+    FAMILY_EVENTS_QUEUE_SIZE: int = 100
+    FAMILY_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    FAMILY_EVENTS_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    # Deletes are remembered this long for GET /sync; older tokens have to
+    # start over with a full sync
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+    # Completed tasks left untouched this long are moved to task_archive by
+    # app.archive_tasks, this many per transaction. It also creates the
+    # monthly partitions of the current month and of this many next ones.
+    TASK_ARCHIVE_AFTER_DAYS: int = 30
+    TASK_ARCHIVE_BATCH_SIZE: int = 1000
+    TASK_ARCHIVE_PARTITIONS_AHEAD: int = 1
+    # Tasks of a deleted list are deleted this many per transaction, so a
+    # long list doesn't hold its locks for the whole delete
+    LIST_DELETE_BATCH_SIZE: int = 1000
+    # Largest batch accepted by POST /tasks/batch, PATCH /tasks/status and
+    # DELETE /tasks/. Each batch is written by a single statement, up to 1000
+    # rows for the INSERT ... RETURNING of POST /tasks/batch.
+    TASK_BATCH_MAX_SIZE: int = 1000
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
@@ -51,6 +87,39 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    # Recycle connections older than this many seconds, -1 disables recycling
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Open a new connection per checkout, e.g. when running behind PgBouncer
+    DB_NULL_POOL: bool = False
+    # Serve requests through an AsyncEngine/AsyncSession instead of running
+    # the sync engine in the threadpool
+    DATABASE_ASYNC: bool = False
+    # Bearer token Prometheus scrapes /metrics with. Without it, /metrics is
+    # only served in local.
+    METRICS_TOKEN: str | None = None
+    # Send the number and duration of a request's SQL statements back in the
+    # Server-Timing and X-DB-Queries headers. Defaults to on in local only.
+    DB_QUERY_HEADERS: bool | None = None
+    # Log a warning when a request runs the same statement, parameters aside,
+    # more than this many times, a likely N+1. 0 disables the warning.
+    DB_REPEATED_QUERY_LIMIT: int = 10
+    # Statements slower than this are logged as JSON on the
+    # app.core.db.slow_queries logger, 0 disables the log. This share of them
+    # also gets its plan: EXPLAIN ANALYZE runs a SELECT a second time, other
+    # statements are only planned.
+    DB_SLOW_QUERY_SECONDS: float = 0.5
+    DB_SLOW_QUERY_EXPLAIN_RATE: float = 0.1
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def db_query_headers(self) -> bool:
+        if self.DB_QUERY_HEADERS is None:
+            return self.ENVIRONMENT == "local"
+        return self.DB_QUERY_HEADERS
 
     ADMIN_USER: str
     ADMIN_USER_PASSWORD: str
@@ -0,0 +1,267 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, Protocol, TypeVar
+
+from prometheus_client import Counter
+
+from app.config import settings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+CACHE_HITS = Counter("cache_hits", "In-process cache hits.", ["cache"])
+CACHE_MISSES = Counter("cache_misses", "In-process cache misses.", ["cache"])
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe in-process cache with a time-to-live per entry and least
+    recently used eviction once maxsize entries are stored.
+
+    A maxsize of 0 disables the cache: every lookup is a miss.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._timer = timer
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """
+        Returns the cached value for key, or None if it is missing or expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._timer():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                CACHE_MISSES.labels(cache=self.name).inc()
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_HITS.labels(cache=self.name).inc()
+            return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Stores value for key, evicting the least recently used entries if full.
+        """
+
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._timer() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """
+        Removes key from the cache, if present.
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns the hit and miss counters and the current size of the cache.
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+# Authenticated users keyed by id, stored as plain field dicts. Entries are
+# invalidated by the crud writes that change a principal; writes made by
+# other worker processes are only picked up once the entry expires.
+principal_cache: TTLCache[uuid.UUID, dict[str, Any]] = TTLCache(
+    "principal",
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+class ResponseCache(Protocol):
+    """
+    Storage for encoded response bodies. Keys embed the version of the data
+    they were built from, so a write makes the old entries unreachable and
+    backends only need to evict, never to invalidate.
+
+    The methods are coroutines, so a networked backend doesn't block the
+    event loop while waiting on the store.
+    """
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes) -> None: ...
+
+
+class MemoryResponseCache:
+    """
+    In-process response cache evicting the least recently used bodies once
+    their total size exceeds max_bytes.
+    """
+
+    def __init__(self, name: str, *, max_bytes: int) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        """
+        Returns the cached body for key, or None if it is missing.
+        """
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                CACHE_MISSES.labels(cache=self.name).inc()
+                return None
+            self._entries.move_to_end(key)
+            CACHE_HITS.labels(cache=self.name).inc()
+            return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """
+        Stores value for key, evicting the least recently used bodies if the
+        cache is over its memory cap. Bodies larger than the cap are skipped.
+        """
+
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NetworkCacheClient(Protocol):
+    """
+    The subset of the redis-py asyncio client API used by
+    NetworkResponseCache.
+    """
+
+    async def get(self, name: str) -> bytes | None: ...
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> Any: ...
+
+
+class NetworkResponseCache:
+    """
+    Response cache shared by every worker through a networked key-value store
+    such as Redis. Entries expire after ttl seconds. Errors talking to the
+    store are logged and treated as misses, so an outage only costs the
+    queries the cache would have saved.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client: NetworkCacheClient,
+        *,
+        ttl: int,
+        prefix: str = "fridge:response:",
+    ) -> None:
+        self.name = name
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        """
+        Returns the cached body for key, or None if it is missing.
+        """
+
+        try:
+            value = await self.client.get(self.prefix + key)
+        except Exception:
+            logger.warning("Response cache get failed", exc_info=True)
+            value = None
+
+        if value is None:
+            CACHE_MISSES.labels(cache=self.name).inc()
+            return None
+        CACHE_HITS.labels(cache=self.name).inc()
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """
+        Stores value for key with the cache's ttl.
+        """
+
+        try:
+            await self.client.set(self.prefix + key, value, ex=self.ttl)
+        except Exception:
+            logger.warning("Response cache set failed", exc_info=True)
+
+
+def create_response_cache() -> ResponseCache | None:
+    """
+    Builds the response cache selected by RESPONSE_CACHE_BACKEND, or returns
+    None if the cache is disabled.
+    """
+
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryResponseCache(
+            "response", max_bytes=settings.RESPONSE_CACHE_MAX_BYTES
+        )
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        # Only needed for this backend, so it is not a hard dependency
+        import redis.asyncio
+
+        return NetworkResponseCache(
+            "response",
+            redis.asyncio.Redis.from_url(str(settings.RESPONSE_CACHE_URL)),
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    return None
+
+
+# Encoded ListsPublic and TasksPublic bodies keyed by their ETag
+response_cache = create_response_cache()
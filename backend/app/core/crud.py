@@ -1,9 +1,42 @@
 import uuid
-
-from sqlmodel import Session, delete, func, select
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Row,
+    Select,
+    Uuid,
+    column,
+    table,
+    text,
+    union,
+)
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import (
+    Session,
+    SQLModel,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    not_,
+    or_,
+    select,
+    tuple_,
+    update,
+)
 
 from app.core import security
+from app.core.cache import principal_cache
 from app.core.models import (
+    ArchivedTaskDisplay,
+    ArchivedTasksPublic,
+    Changes,
+    Cursor,
     Family,
     FamilyRelationship,
     List,
@@ -12,24 +45,33 @@ from app.core.models import (
     ListsPublic,
     ListUpdate,
     Task,
+    TaskArchive,
     TaskCreate,
+    TaskDisplay,
     TasksPublic,
     TaskUpdate,
+    Tombstone,
     User,
     UserCreate,
+    UserPublic,
     UserRelationship,
     UsersPublic,
 )
+from app.core.utils import encode_cursor, encode_sync_token
 
 
-def create_user(*, session: Session, user_create: UserCreate) -> User:
+def create_user(
+    *, session: Session, user_create: UserCreate, hashed_password: str | None = None
+) -> User:
     """
     Creates a new user in the database and returns the created user object.
+    The password is hashed here unless an already computed hash is passed.
     """
 
+    if hashed_password is None:
+        hashed_password = security.get_password_hash(user_create.password)
     db_user = User.model_validate(
-        user_create,
-        update={"hashed_password": security.get_password_hash(user_create.password)},
+        user_create, update={"hashed_password": hashed_password}
     )
     session.add(db_user)
     session.commit()
@@ -49,109 +91,240 @@ def create_task(*, session: Session, task_in: TaskCreate) -> Task:
     return db_task
 
 
+def create_tasks(*, session: Session, tasks_in: Sequence[TaskCreate]) -> list[Task]:
+    """
+    Creates many tasks with a single multi-row INSERT ... RETURNING and returns
+    the created task objects in the order they were given.
+    """
+
+    rows = [Task.model_validate(task_in).model_dump() for task_in in tasks_in]
+    # Returning plain rows keeps the inserted tasks out of the identity map, so
+    # they aren't expired by the commit and reloaded one by one afterwards.
+    statement = insert(Task).returning(
+        *Task.__table__.columns, sort_by_parameter_order=True
+    )
+    db_tasks = [
+        Task.model_validate(row._mapping)
+        for row in session.exec(statement, params=rows)
+    ]
+    session.commit()
+    return db_tasks
+
+
+def _id_in(column: Any, ids: Sequence[uuid.UUID]) -> ColumnElement[bool]:
+    """
+    Builds `column = ANY(:ids)`, which binds the ids as a single array parameter
+    no matter how many there are.
+    """
+
+    return column == any_(bindparam("ids", list(ids), type_=ARRAY(Uuid)))
+
+
 def create_list(
     *,
     session: Session,
     list_in: ListCreate,
     relationship_data: UserRelationship | FamilyRelationship,
+    commit: bool = True,
 ) -> List:
     """
     Creates a new list in the database and returns the created list object.
+    With commit=False the list is only added to the caller's transaction.
     """
 
     db_list = List.model_validate(list_in, update=relationship_data)
     session.add(db_list)
-    session.commit()
-    session.refresh(db_list)
+    if commit:
+        session.commit()
+        session.refresh(db_list)
     return db_list
 
 
+def _read_page(
+    *,
+    session: Session,
+    statement: Select,
+    count_statement: Select,
+    skip: int,
+    limit: int,
+    cursor: Cursor | None,
+    with_count: bool,
+) -> tuple[Sequence[Row], int | None, str | None]:
+    """
+    Fetches limit + 1 rows with statement, which must select created_at and
+    id, and returns the page trimmed to limit rows, the total count and the
+    cursor of its last row, or None when there is no next page.
+
+    The total is read in the same round trip with count(*) OVER (). After a
+    cursor the window only covers the following rows, so count_statement is
+    run instead, as it is when the page is empty. Without with_count the
+    count is None and only the extra row tells whether there is a next page.
+    """
+
+    window = with_count and cursor is None
+    if window:
+        statement = statement.add_columns(func.count().over().label("total"))
+    rows = session.exec(statement.offset(skip).limit(limit + 1)).all()
+
+    count = None
+    if window and rows:
+        count = rows[0].total
+    elif window and not skip:
+        count = 0
+    elif with_count:
+        count = session.exec(count_statement).one()
+
+    if len(rows) <= limit:
+        return rows, count, None
+
+    rows = rows[:limit]
+    return rows, count, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def _public_columns(table: type[SQLModel], public: type[SQLModel]) -> list[Any]:
+    """
+    Returns the columns of table backing the fields of public. Read paths
+    select them and validate the rows straight into public, without loading
+    and tracking ORM instances nor reading columns like hashed_password.
+    """
+
+    columns = table.__table__.columns
+    return [columns[name] for name in public.model_fields if name in columns]
+
+
+def _read_lists(
+    *,
+    session: Session,
+    where: ColumnElement[bool],
+    skip: int,
+    limit: int,
+    cursor: Cursor | None,
+    with_count: bool,
+) -> ListsPublic:
+    """
+    Fetches a page of lists together with their task counts, which are read
+    from the counters the database keeps on each list.
+    """
+
+    statement = select(
+        *_public_columns(List, ListDisplay),
+        (List.open_count + List.completed_count).label("task_count"),
+        List.created_at,
+    ).where(where)
+    if cursor:
+        statement = statement.where(
+            tuple_(List.created_at, List.id)
+            > tuple_(cursor["created_at"], cursor["id"])
+        )
+    rows, count, next_cursor = _read_page(
+        session=session,
+        statement=statement.order_by(List.created_at, List.id),
+        count_statement=select(func.count()).select_from(List).where(where),
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_count=with_count,
+    )
+    return ListsPublic(
+        data=[ListDisplay.model_validate(row) for row in rows],
+        count=count,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
+    )
+
+
 def read_personal_lists(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Cursor | None = None,
+    with_count: bool = True,
 ) -> ListsPublic:
     """
     Fetches a user's personal lists from the database.
     """
 
-    count_statement = (
-        select(func.count()).select_from(List).where(List.user_id == user_id)
+    return _read_lists(
+        session=session,
+        where=List.user_id == user_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_count=with_count,
     )
-    count = session.exec(count_statement).one()
-    statement = select(List).where(List.user_id == user_id).offset(skip).limit(limit)
-    db_lists = session.exec(statement).all()
-    data = []
-    for db_list in db_lists:
-        task_count_statement = (
-            select(func.count()).select_from(Task).where(Task.list_id == db_list.id)
-        )
-        task_count = session.exec(task_count_statement).one()
-        list_display = ListDisplay.model_validate(
-            db_list, update={"task_count": task_count}
-        )
-        data.append(list_display)
-
-    return ListsPublic(data=data, count=count)
 
 
 def read_list_tasks(
-    *, session: Session, list_id: uuid.UUID, skip: int = 0, limit: int = 100
+    *,
+    session: Session,
+    list_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Cursor | None = None,
+    with_count: bool = True,
 ) -> TasksPublic:
     """
-    Fetches a lists's tasks from the database.
+    Fetches a lists's tasks from the database, newest first.
     """
 
-    count_statement = (
-        select(func.count()).select_from(Task).where(Task.list_id == list_id)
+    statement = select(*_public_columns(Task, TaskDisplay)).where(
+        Task.list_id == list_id
     )
-    count = session.exec(count_statement).one()
-    statement = (
-        select(Task)
-        .where(Task.list_id == list_id)
-        .order_by(Task.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+    if cursor:
+        statement = statement.where(
+            tuple_(Task.created_at, Task.id)
+            < tuple_(cursor["created_at"], cursor["id"])
+        )
+    rows, count, next_cursor = _read_page(
+        session=session,
+        statement=statement.order_by(Task.created_at.desc(), Task.id.desc()),
+        count_statement=select(func.count())
+        .select_from(Task)
+        .where(Task.list_id == list_id),
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_count=with_count,
+    )
+    return TasksPublic(
+        data=[TaskDisplay.model_validate(row) for row in rows],
+        count=count,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
     )
-    tasks = session.exec(statement).all()
-    return TasksPublic(data=tasks, count=count)
 
 
 def clear_list_tasks(*, session: Session, list_id: uuid.UUID) -> None:
     """
-    Clears a lists's completes tasks.
+    Clears a lists's completes tasks, moving them to the archive.
     """
 
-    statement = delete(Task).where(Task.list_id == list_id, Task.completed)
-    session.exec(statement)
-    session.commit()
+    archive_tasks(session=session, where=Task.list_id == list_id)
 
 
 def read_family_lists(
-    *, session: Session, family_id: uuid.UUID, skip: int = 0, limit: int = 100
+    *,
+    session: Session,
+    family_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Cursor | None = None,
+    with_count: bool = True,
 ) -> ListsPublic:
     """
     Fetches a family's lists from the database.
     """
 
-    count_statement = (
-        select(func.count()).select_from(List).where(List.family_id == family_id)
+    return _read_lists(
+        session=session,
+        where=List.family_id == family_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_count=with_count,
     )
-    count = session.exec(count_statement).one()
-    statement = (
-        select(List).where(List.family_id == family_id).offset(skip).limit(limit)
-    )
-    db_lists = session.exec(statement).all()
-    data = []
-    for db_list in db_lists:
-        task_count_statement = (
-            select(func.count()).select_from(Task).where(Task.list_id == db_list.id)
-        )
-        task_count = session.exec(task_count_statement).one()
-        list_display = ListDisplay.model_validate(
-            db_list, update={"task_count": task_count}
-        )
-        data.append(list_display)
-
-    return ListsPublic(data=data, count=count)
 
 
 def read_family_members(
@@ -160,56 +333,99 @@ def read_family_members(
     family_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100,
+    cursor: Cursor | None = None,
+    with_count: bool = True,
 ) -> UsersPublic:
     """
     Fetches a family's members from the database.
     """
 
-    count_statement = select(func.count(User.id)).where(User.family_id == family_id)
-    count = session.exec(count_statement).one()
-    statement = (
-        select(User).where(User.family_id == family_id).offset(skip).limit(limit)
+    statement = select(*_public_columns(User, UserPublic), User.created_at).where(
+        User.family_id == family_id
+    )
+    if cursor:
+        statement = statement.where(
+            tuple_(User.created_at, User.id)
+            > tuple_(cursor["created_at"], cursor["id"])
+        )
+    rows, count, next_cursor = _read_page(
+        session=session,
+        statement=statement.order_by(User.created_at, User.id),
+        count_statement=select(func.count(User.id)).where(User.family_id == family_id),
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_count=with_count,
+    )
+    return UsersPublic(
+        data=[UserPublic.model_validate(row) for row in rows],
+        count=count,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
     )
-    users = session.exec(statement).all()
-    return UsersPublic(data=users, count=count)
 
 
-def create_family(*, session: Session, name: str) -> Family:
+def create_family(*, session: Session, name: str, commit: bool = True) -> Family:
     """
-    Creates a new family in the db.
+    Creates a new family in the db. With commit=False the family is only added
+    to the caller's transaction.
     """
 
     db_family = Family(name=name)
     session.add(db_family)
-    session.commit()
-    session.refresh(db_family)
+    if commit:
+        session.commit()
+        session.refresh(db_family)
     return db_family
 
 
-def promote_user_to_admin(*, session: Session, db_user: User) -> User:
+def promote_user_to_admin(
+    *, session: Session, db_user: User, commit: bool = True
+) -> User:
     """
-    Promotes  a user to admin.
+    Promotes  a user to admin. With commit=False the caller commits and
+    invalidates the cached principal.
     """
 
     db_user.sqlmodel_update({"is_admin": True})
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    if commit:
+        session.commit()
+        principal_cache.invalidate(db_user.id)
+        session.refresh(db_user)
     return db_user
 
 
-def demote_admin_to_user(*, session: Session, db_admin_user: User) -> User:
+def demote_admin_to_user(
+    *, session: Session, db_admin_user: User, commit: bool = True
+) -> User:
     """
-    Demotes  a user to admin.
+    Demotes  a user to admin. With commit=False the caller commits and
+    invalidates the cached principal.
     """
 
     db_admin_user.sqlmodel_update({"is_admin": False})
     session.add(db_admin_user)
-    session.commit()
-    session.refresh(db_admin_user)
+    if commit:
+        session.commit()
+        principal_cache.invalidate(db_admin_user.id)
+        session.refresh(db_admin_user)
     return db_admin_user
 
 
+def transfer_admin(*, session: Session, db_user: User, db_admin_user: User) -> User:
+    """
+    Promotes a user to admin and demotes the current admin in one transaction.
+    """
+
+    promote_user_to_admin(session=session, db_user=db_user, commit=False)
+    demote_admin_to_user(session=session, db_admin_user=db_admin_user, commit=False)
+    session.commit()
+    principal_cache.invalidate(db_user.id)
+    principal_cache.invalidate(db_admin_user.id)
+    return db_user
+
+
 def update_list(*, session: Session, db_list: List, list_in: ListUpdate) -> List:
     """
     Updates a list in the db.
@@ -236,18 +452,82 @@ def update_task(*, session: Session, db_task: Task, task_in: TaskUpdate) -> List
     return db_task
 
 
-def join_family(*, session: Session, db_user: User, family_id: uuid.UUID) -> User:
+def join_family(
+    *, session: Session, db_user: User, family_id: uuid.UUID, commit: bool = True
+) -> User:
     """
-    Updates a user's family id, joins the user to the family.
+    Updates a user's family id, joins the user to the family. With commit=False
+    the caller commits and invalidates the cached principal.
     """
 
     db_user.sqlmodel_update({"family_id": family_id})
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    if commit:
+        session.commit()
+        principal_cache.invalidate(db_user.id)
+        session.refresh(db_user)
     return db_user
 
 
+def create_family_with_admin(
+    *,
+    session: Session,
+    db_user: User,
+    name: str,
+    family_list_in: ListCreate,
+    personal_list_in: ListCreate,
+) -> Family:
+    """
+    Creates a family with the user as its admin, along with the family's list
+    and the user's personal list, in one transaction.
+    """
+
+    db_family = create_family(session=session, name=name, commit=False)
+    join_family(session=session, db_user=db_user, family_id=db_family.id, commit=False)
+    promote_user_to_admin(session=session, db_user=db_user, commit=False)
+    create_list(
+        session=session,
+        list_in=family_list_in,
+        relationship_data={"family_id": db_family.id},
+        commit=False,
+    )
+    create_list(
+        session=session,
+        list_in=personal_list_in,
+        relationship_data={"user_id": db_user.id},
+        commit=False,
+    )
+    session.commit()
+    principal_cache.invalidate(db_user.id)
+    session.refresh(db_family)
+    return db_family
+
+
+def join_family_with_list(
+    *,
+    session: Session,
+    db_user: User,
+    db_family: Family,
+    personal_list_in: ListCreate,
+) -> Family:
+    """
+    Joins the user to the family and creates the user's personal list in one
+    transaction.
+    """
+
+    join_family(session=session, db_user=db_user, family_id=db_family.id, commit=False)
+    create_list(
+        session=session,
+        list_in=personal_list_in,
+        relationship_data={"user_id": db_user.id},
+        commit=False,
+    )
+    session.commit()
+    principal_cache.invalidate(db_user.id)
+    session.refresh(db_family)
+    return db_family
+
+
 def update_task_status(*, session: Session, db_task: Task, completed: bool) -> Task:
     """
     Updates a task's status.
@@ -270,11 +550,94 @@ def delete_task(*, session: Session, db_task: Task) -> Task:
     return db_task
 
 
-def delete_list(*, session: Session, db_list: List) -> List:
+def update_tasks_status(
+    *, session: Session, ids: Sequence[uuid.UUID], completed: bool
+) -> None:
     """
-    Deletes a list.
+    Updates the status of many tasks with a single UPDATE.
+    Does nothing when there are no ids.
     """
 
+    if not ids:
+        return
+
+    statement = (
+        update(Task)
+        .where(_id_in(Task.id, ids))
+        .values(completed=completed)
+        .execution_options(synchronize_session=False)
+    )
+    session.exec(statement)
+    session.commit()
+
+
+def delete_tasks(*, session: Session, ids: Sequence[uuid.UUID]) -> None:
+    """
+    Deletes many tasks with a single DELETE.
+    Does nothing when there are no ids.
+    """
+
+    if not ids:
+        return
+
+    statement = (
+        delete(Task)
+        .where(_id_in(Task.id, ids))
+        .execution_options(synchronize_session=False)
+    )
+    session.exec(statement)
+    session.commit()
+
+
+def _delete_in_batches(
+    *,
+    session: Session,
+    model: type[SQLModel],
+    where: ColumnElement[bool],
+    batch_size: int,
+    local_settings: dict[str, str] | None = None,
+) -> int:
+    """
+    Deletes the rows of model matching where, batch_size rows per transaction,
+    and returns how many were deleted. local_settings are set for each
+    transaction only.
+    """
+
+    primary_key = tuple_(*model.__table__.primary_key.columns)
+    deleted = 0
+    while True:
+        for name, value in (local_settings or {}).items():
+            session.exec(select(func.set_config(name, value, True)))
+        batch = select(*model.__table__.primary_key.columns).where(where)
+        statement = (
+            delete(model)
+            .where(primary_key.in_(batch.limit(batch_size)))
+            .execution_options(synchronize_session=False)
+        )
+        result = session.exec(statement)
+        session.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def delete_list(*, session: Session, db_list: List, batch_size: int = 1000) -> List:
+    """
+    Deletes a list. Its tasks and archived tasks are deleted first,
+    batch_size per transaction, whatever is left is deleted by the foreign
+    keys' cascade along with the list. With fridge.deleting_list_id set, the
+    task delete triggers write no tombstones and bump no versions for the
+    batches; the list's tombstone and version bump cover its tasks.
+    """
+
+    for model, list_id in ((Task, Task.list_id), (TaskArchive, TaskArchive.list_id)):
+        _delete_in_batches(
+            session=session,
+            model=model,
+            where=list_id == db_list.id,
+            batch_size=batch_size,
+            local_settings={"fridge.deleting_list_id": str(db_list.id)},
+        )
     session.delete(db_list)
     session.commit()
     return db_list
@@ -293,6 +656,65 @@ def authenticate(*, session: Session, email: str, password: str) -> User | None:
     return db_user
 
 
+def read_list_count_drift(*, session: Session) -> Sequence[Any]:
+    """
+    Fetches the lists whose stored task counters don't match their tasks, with
+    the stored and the actual counts.
+    """
+
+    actual = (
+        select(
+            Task.list_id,
+            func.count().filter(not_(Task.completed)).label("open_count"),
+            func.count().filter(Task.completed).label("completed_count"),
+        )
+        .group_by(Task.list_id)
+        .subquery()
+    )
+    actual_open = func.coalesce(actual.c.open_count, 0)
+    actual_completed = func.coalesce(actual.c.completed_count, 0)
+    statement = (
+        select(
+            List.id,
+            List.open_count,
+            List.completed_count,
+            actual_open.label("actual_open_count"),
+            actual_completed.label("actual_completed_count"),
+        )
+        .outerjoin(actual, actual.c.list_id == List.id)
+        .where(
+            (List.open_count != actual_open)
+            | (List.completed_count != actual_completed)
+        )
+    )
+    return session.exec(statement).all()
+
+
+def repair_list_counts(*, session: Session, ids: Sequence[uuid.UUID]) -> None:
+    """
+    Recomputes the task counters of the given lists from their tasks.
+    """
+
+    open_count = (
+        select(func.count())
+        .where(Task.list_id == List.id, not_(Task.completed))
+        .scalar_subquery()
+    )
+    completed_count = (
+        select(func.count())
+        .where(Task.list_id == List.id, Task.completed)
+        .scalar_subquery()
+    )
+    statement = (
+        update(List)
+        .where(_id_in(List.id, ids))
+        .values(open_count=open_count, completed_count=completed_count)
+        .execution_options(synchronize_session=False)
+    )
+    session.exec(statement)
+    session.commit()
+
+
 def read_user_by_email(*, session: Session, email: str) -> User | None:
     """
     Fetches a user from the database by their email address.
@@ -313,6 +735,17 @@ def read_user_by_id(*, session: Session, id: uuid.UUID) -> User | None:
     return session_user
 
 
+def attach_cached_user(*, session: Session, user_data: dict[str, Any]) -> User:
+    """
+    Attaches a user loaded by an earlier session, e.g. from the principal cache,
+    to the session as a persistent object without querying the database.
+    """
+
+    db_user = User.model_validate(user_data)
+    make_transient_to_detached(db_user)
+    return session.merge(db_user, load=False)
+
+
 def read_task_by_id(*, session: Session, id: uuid.UUID) -> Task | None:
     """
     Fetches a task from the database by their id.
@@ -323,6 +756,20 @@ def read_task_by_id(*, session: Session, id: uuid.UUID) -> Task | None:
     return session_task
 
 
+def read_tasks_by_ids(
+    *, session: Session, ids: Sequence[uuid.UUID], for_update: bool = False
+) -> Sequence[Task]:
+    """
+    Fetches many tasks from the database by their ids, optionally locking them
+    until the end of the transaction.
+    """
+
+    statement = select(Task).where(_id_in(Task.id, ids))
+    if for_update:
+        statement = statement.with_for_update()
+    return session.exec(statement).all()
+
+
 def read_list_by_id(*, session: Session, id: uuid.UUID) -> List | None:
     """
     Fetches a task from the database by their id.
@@ -351,3 +798,235 @@ def read_family_by_id(*, session: Session, id: uuid.UUID) -> Family | None:
     statement = select(Family).where(Family.id == id)
     session_family = session.exec(statement).first()
     return session_family
+
+
+def read_family_version(*, session: Session, id: uuid.UUID) -> int:
+    """
+    Fetches the version of a family's lists and tasks.
+    """
+
+    statement = select(Family.version).where(Family.id == id)
+    return session.exec(statement).first() or 0
+
+
+def read_user_version(*, session: Session, id: uuid.UUID) -> int:
+    """
+    Fetches the version of a user's personal lists and tasks.
+    """
+
+    statement = select(User.version).where(User.id == id)
+    return session.exec(statement).first() or 0
+
+
+def read_changes(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    family_id: uuid.UUID | None,
+    since: datetime | None = None,
+) -> Changes:
+    """
+    Fetches the user's personal and family lists and tasks written since the
+    given time, and the ids of those deleted since then. Without since every
+    list and task is returned.
+    """
+
+    # updated_at holds the start time of the writing transaction, so rows of
+    # transactions still open can commit with a time before now(). The next
+    # sync therefore starts at the oldest open transaction.
+    token_time = session.exec(
+        text(
+            """
+            SELECT least(now(), min(xact_start)) AT TIME ZONE 'UTC'
+            FROM pg_stat_activity
+            WHERE datname = current_database() AND backend_type = 'client backend'
+            """
+        )
+    ).scalar_one()
+
+    owned_list = List.user_id == user_id
+    owned_tombstone = Tombstone.user_id == user_id
+    if family_id:
+        owned_list = or_(owned_list, List.family_id == family_id)
+        owned_tombstone = or_(owned_tombstone, Tombstone.family_id == family_id)
+
+    lists_statement = select(List).where(owned_list)
+    tasks_statement = select(Task).where(
+        Task.list_id.in_(select(List.id).where(owned_list))
+    )
+    deleted = []
+    if since:
+        lists_statement = lists_statement.where(List.updated_at >= since)
+        tasks_statement = tasks_statement.where(Task.updated_at >= since)
+        tombstones_statement = select(Tombstone.id, Tombstone.kind).where(
+            owned_tombstone, Tombstone.deleted_at >= since
+        )
+        deleted = session.exec(tombstones_statement).all()
+
+    return Changes(
+        lists=session.exec(lists_statement).all(),
+        tasks=session.exec(tasks_statement).all(),
+        deleted_list_ids=[row.id for row in deleted if row.kind == "list"],
+        deleted_task_ids=[row.id for row in deleted if row.kind == "task"],
+        token=encode_sync_token(token_time),
+    )
+
+
+def delete_tombstones(*, session: Session, before: datetime) -> int:
+    """
+    Deletes the tombstones of rows deleted before the given time and returns
+    how many were deleted.
+    """
+
+    statement = delete(Tombstone).where(Tombstone.deleted_at < before)
+    result = session.exec(statement)
+    session.commit()
+    return result.rowcount
+
+
+def create_task_archive_partitions(
+    *, session: Session, before: datetime, months_ahead: int = 1
+) -> int:
+    """
+    Creates the monthly task_archive partitions needed by the tasks completed
+    before the given time, by the rows waiting in the default partition, and
+    for the current month and the months_ahead next ones. Returns how many
+    were created. Each partition is created in its own transaction.
+    """
+
+    month = func.date_trunc("month", Task.created_at)
+    default_month = func.date_trunc("month", column("created_at"))
+    current_month = func.date_trunc("month", func.timezone("UTC", func.now()))
+    months = set(
+        session.exec(
+            union(
+                select(month).where(Task.completed, Task.updated_at < before),
+                select(default_month).select_from(table("task_archive_default")),
+                select(
+                    current_month
+                    + func.make_interval(0, func.generate_series(0, months_ahead))
+                ),
+            )
+        ).scalars()
+    )
+    session.commit()
+
+    created = 0
+    for first_day in sorted(months):
+        created += session.exec(
+            select(func.create_task_archive_partition(first_day.date()))
+        ).one()
+        session.commit()
+    return created
+
+
+def archive_tasks(
+    *,
+    session: Session,
+    where: ColumnElement[bool],
+    batch_size: int = 1000,
+    skip_locked: bool = False,
+) -> int:
+    """
+    Moves the completed tasks matching where into task_archive, batch_size
+    tasks per transaction, and returns how many were moved. Each batch is
+    deleted and inserted by a single statement. Tasks locked by another
+    transaction are waited for, or skipped with skip_locked.
+
+    Tasks of a month without a partition land in the default partition, see
+    create_task_archive_partitions.
+    """
+
+    # Core tables rather than the models, the ORM doesn't handle a DELETE
+    # ... RETURNING inside an INSERT ... SELECT
+    task, task_archive = Task.__table__, TaskArchive.__table__
+    columns = [column.name for column in task.columns]
+    archived = 0
+    while True:
+        batch = session.exec(
+            select(Task.id)
+            .where(Task.completed, where)
+            .limit(batch_size)
+            .with_for_update(skip_locked=skip_locked)
+        ).all()
+        if not batch:
+            break
+
+        moved = (
+            delete(task)
+            .where(task.c.id == any_(bindparam("ids", type_=ARRAY(Uuid))))
+            .returning(*task.columns)
+            .cte("moved")
+        )
+        statement = insert(task_archive).from_select(
+            [*columns, "archived_at"],
+            select(
+                *(moved.c[name] for name in columns),
+                func.timezone("UTC", func.now()),
+            ),
+        )
+        session.exec(statement, params={"ids": list(batch)})
+        session.commit()
+        archived += len(batch)
+        if len(batch) < batch_size:
+            break
+    return archived
+
+
+def archive_completed_tasks(
+    *, session: Session, before: datetime, batch_size: int = 1000
+) -> int:
+    """
+    Archives the tasks completed, and left untouched, since before the given
+    time and returns how many were archived. Tasks locked by another
+    transaction are left for the next run.
+    """
+
+    return archive_tasks(
+        session=session,
+        where=Task.updated_at < before,
+        batch_size=batch_size,
+        skip_locked=True,
+    )
+
+
+def read_archived_tasks(
+    *,
+    session: Session,
+    list_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Cursor | None = None,
+    with_count: bool = True,
+) -> ArchivedTasksPublic:
+    """
+    Fetches a lists's archived tasks from the database, newest first.
+    """
+
+    statement = select(*_public_columns(TaskArchive, ArchivedTaskDisplay)).where(
+        TaskArchive.list_id == list_id
+    )
+    if cursor:
+        statement = statement.where(
+            tuple_(TaskArchive.created_at, TaskArchive.id)
+            < tuple_(cursor["created_at"], cursor["id"])
+        )
+    rows, count, next_cursor = _read_page(
+        session=session,
+        statement=statement.order_by(
+            TaskArchive.created_at.desc(), TaskArchive.id.desc()
+        ),
+        count_statement=select(func.count())
+        .select_from(TaskArchive)
+        .where(TaskArchive.list_id == list_id),
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_count=with_count,
+    )
+    return ArchivedTasksPublic(
+        data=[ArchivedTaskDisplay.model_validate(row) for row in rows],
+        count=count,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
+    )
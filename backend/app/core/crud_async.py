@@ -0,0 +1,119 @@
+"""
+Awaitable counterparts of the functions in app.core.crud.
+
+The session handed out by the API is either an AsyncSession (DATABASE_ASYNC)
+or a regular Session. With an AsyncSession the sync crud function runs through
+AsyncSession.run_sync, so every statement goes through the async psycopg
+driver on the event loop. With a regular Session the call is dispatched to the
+threadpool, which is what FastAPI did for the former sync routes.
+"""
+
+import functools
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from anyio import to_thread
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import crud, security
+from app.core.models import User, UserCreate
+
+T = TypeVar("T")
+
+
+def _to_async(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """
+    Wraps a keyword-only crud function so it can be awaited with either kind
+    of session.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*, session: Session | AsyncSession, **kwargs: Any) -> T:
+        if isinstance(session, AsyncSession):
+            return await session.run_sync(
+                lambda sync_session: fn(session=sync_session, **kwargs)
+            )
+        return await to_thread.run_sync(
+            functools.partial(fn, session=session, **kwargs)
+        )
+
+    return wrapper
+
+
+create_task = _to_async(crud.create_task)
+create_tasks = _to_async(crud.create_tasks)
+create_list = _to_async(crud.create_list)
+read_personal_lists = _to_async(crud.read_personal_lists)
+read_list_tasks = _to_async(crud.read_list_tasks)
+clear_list_tasks = _to_async(crud.clear_list_tasks)
+read_family_lists = _to_async(crud.read_family_lists)
+read_family_members = _to_async(crud.read_family_members)
+create_family = _to_async(crud.create_family)
+promote_user_to_admin = _to_async(crud.promote_user_to_admin)
+demote_admin_to_user = _to_async(crud.demote_admin_to_user)
+transfer_admin = _to_async(crud.transfer_admin)
+update_list = _to_async(crud.update_list)
+update_task = _to_async(crud.update_task)
+join_family = _to_async(crud.join_family)
+create_family_with_admin = _to_async(crud.create_family_with_admin)
+join_family_with_list = _to_async(crud.join_family_with_list)
+update_task_status = _to_async(crud.update_task_status)
+delete_task = _to_async(crud.delete_task)
+update_tasks_status = _to_async(crud.update_tasks_status)
+delete_tasks = _to_async(crud.delete_tasks)
+delete_list = _to_async(crud.delete_list)
+read_user_by_email = _to_async(crud.read_user_by_email)
+read_user_by_id = _to_async(crud.read_user_by_id)
+read_task_by_id = _to_async(crud.read_task_by_id)
+read_tasks_by_ids = _to_async(crud.read_tasks_by_ids)
+read_list_by_id = _to_async(crud.read_list_by_id)
+read_family_by_invite_code = _to_async(crud.read_family_by_invite_code)
+read_family_by_id = _to_async(crud.read_family_by_id)
+read_family_version = _to_async(crud.read_family_version)
+read_user_version = _to_async(crud.read_user_version)
+read_changes = _to_async(crud.read_changes)
+read_archived_tasks = _to_async(crud.read_archived_tasks)
+
+
+async def attach_cached_user(
+    *, session: Session | AsyncSession, user_data: dict[str, Any]
+) -> User:
+    """
+    Attaches a cached user to the session. This never touches the database, so
+    it runs inline instead of through run_sync or the threadpool.
+    """
+
+    if isinstance(session, AsyncSession):
+        session = session.sync_session
+    return crud.attach_cached_user(session=session, user_data=user_data)
+
+
+async def create_user(
+    *, session: Session | AsyncSession, user_create: UserCreate
+) -> User:
+    """
+    Creates a new user. The password is hashed in the hashing process pool so
+    bcrypt never runs on the event loop or holds a threadpool thread.
+    """
+
+    hashed_password = await security.get_password_hash_async(user_create.password)
+    return await _to_async(crud.create_user)(
+        session=session, user_create=user_create, hashed_password=hashed_password
+    )
+
+
+async def authenticate(
+    *, session: Session | AsyncSession, email: str, password: str
+) -> User | None:
+    """
+    Authenticates a user by checking the provided email and password against the
+    database, verifying the password in the hashing process pool.
+    """
+
+    db_user = await read_user_by_email(session=session, email=email)
+    if not db_user:
+        return None
+    if not await security.verify_password_async(password, db_user.hashed_password):
+        return None
+    return db_user
@@ -1,10 +1,285 @@
+import collections
+import json
+import logging
+import random
+import re
+import time
+from collections.abc import Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import psycopg
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from sqlmodel import Session, create_engine, select
 
 from app.config import settings
 from app.core import crud
 from app.core.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections currently open beyond the pool size.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries",
+    "Statements slower than DB_SLOW_QUERY_SECONDS.",
+    ["engine"],
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the pool.",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a connection,
+    and keeps the pool gauges up to date on every checkout and checkin.
+
+    The engine label is a pool argument, carried over to the pool built by
+    recreate() when the engine is disposed.
+    """
+
+    def __init__(
+        self, creator: Any, engine_label: str = "default", **kwargs: Any
+    ) -> None:
+        super().__init__(creator, **kwargs)
+        self._engine_label = engine_label
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        pool._engine_label = self._engine_label
+        return pool
+
+    def _update_gauges(self) -> None:
+        checked_out = self.checkedout()
+        DB_POOL_CHECKED_OUT.labels(engine=self._engine_label).set(checked_out)
+        DB_POOL_OVERFLOW.labels(engine=self._engine_label).set(
+            max(checked_out - self.size(), 0)
+        )
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(engine=self._engine_label).observe(
+                time.perf_counter() - start
+            )
+            self._update_gauges()
+
+    def _do_return_conn(self, record: Any) -> None:
+        try:
+            super()._do_return_conn(record)
+        finally:
+            self._update_gauges()
+
+
+class TimedAsyncAdaptedQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waited.
+    """
+
+
+def engine_options(pool_class: type[TimedQueuePool], label: str) -> dict[str, Any]:
+    """
+    Returns the create_engine options for the configured connection pool,
+    whose metrics are labelled with label.
+    """
+
+    if settings.DB_NULL_POOL:
+        return {"poolclass": NullPool}
+
+    return {
+        "poolclass": pool_class,
+        "engine_label": label,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+@dataclass
+class QueryStats:
+    """
+    SQL statements run on behalf of one request.
+    """
+
+    count: int = 0
+    seconds: float = 0.0
+    # Statement shape -> times it was run
+    shapes: collections.Counter[str] = field(default_factory=collections.Counter)
+    # ASGI scope of the request, which holds the route once it is matched
+    scope: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def route(self) -> str | None:
+        return getattr(self.scope.get("route"), "unique_id", None)
+
+
+slow_query_logger = logging.getLogger(f"{__name__}.slow_queries")
+
+# Set by QueryStatsMiddleware for the duration of each request. The threads
+# and greenlets running the statements work on copies of the context, so the
+# QueryStats object is shared rather than the variable being set again.
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# A parenthesized list of bound parameters, as rendered for IN (...) and
+# multi-row VALUES, whose length varies with the number of values
+PARAMETER_LIST = re.compile(r"\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Returns the statement with its whitespace normalized and its parameter
+    lists collapsed, so runs with different values compare equal.
+    """
+
+    return PARAMETER_LIST.sub("(...)", " ".join(statement.split()))
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """
+    Returns the names and types of the bound parameters, leaving out their
+    values, which may be personal data.
+    """
+
+    if isinstance(parameters, Mapping):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, list):
+        return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def explain(conn: Connection, statement: str, parameters: Any) -> Any:
+    """
+    Returns the JSON plan of a statement that was just run on conn. SELECTs
+    are analyzed, other statements are only planned so they aren't applied
+    twice. The EXPLAIN runs in a savepoint, so that its failure doesn't abort
+    the transaction.
+    """
+
+    options = "ANALYZE, BUFFERS, " if statement.lstrip()[:6].upper() == "SELECT" else ""
+    explain_cursor = conn.connection.cursor()
+    try:
+        explain_cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            explain_cursor.execute(
+                f"EXPLAIN ({options}FORMAT JSON) {statement}", parameters
+            )
+            plan = explain_cursor.fetchone()[0]
+        except Exception:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        finally:
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        explain_cursor.close()
+    return plan
+
+
+def log_slow_query(
+    label: str,
+    conn: Connection,
+    statement: str,
+    parameters: Any,
+    executemany: bool,
+    elapsed: float,
+) -> None:
+    """
+    Logs a slow statement as a JSON object, with its plan for a sample of
+    them.
+    """
+
+    DB_SLOW_QUERIES.labels(engine=label).inc()
+    stats = query_stats.get()
+    record: dict[str, Any] = {
+        "event": "slow_query",
+        "engine": label,
+        "duration_ms": round(elapsed * 1000, 2),
+        "route": stats.route if stats is not None else None,
+        "statement": " ".join(statement.split()),
+        "parameters": parameter_shape(parameters),
+    }
+    if not executemany and random.random() < settings.DB_SLOW_QUERY_EXPLAIN_RATE:
+        try:
+            record["plan"] = explain(conn, statement, parameters)
+        except (psycopg.Error, DBAPIError) as e:
+            record["plan_error"] = str(e)
+    slow_query_logger.warning(json.dumps(record, default=str))
+
+
+def instrument_queries(db_engine: Engine, label: str) -> None:
+    """
+    Adds every statement run on db_engine, and its duration, to the
+    QueryStats of the current request, and logs the slow ones.
+    """
+
+    @event.listens_for(db_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        *args: Any,
+    ) -> None:
+        context.query_start = time.perf_counter()
+
+    @event.listens_for(db_engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        elapsed = time.perf_counter() - context.query_start
+        stats = query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+            stats.shapes[statement_shape(statement)] += 1
+        if settings.DB_SLOW_QUERY_SECONDS and elapsed >= settings.DB_SLOW_QUERY_SECONDS:
+            log_slow_query(label, conn, statement, parameters, executemany, elapsed)
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI), **engine_options(TimedQueuePool, "sync")
+)
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    **engine_options(TimedAsyncAdaptedQueuePool, "async"),
+)
+instrument_queries(engine, "sync")
+instrument_queries(async_engine.sync_engine, "async")
+
+
+def libpq_conninfo() -> str:
+    """
+    Returns the database URL in the form psycopg expects, for the connections
+    opened outside of the engines.
+    """
+
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -0,0 +1,152 @@
+"""
+Live change events for families.
+
+The task and list triggers NOTIFY the family_events channel whenever they
+bump a family's version, see the add_family_events migration. Each worker
+process keeps a single LISTEN connection, opened on the first subscription,
+and fans the notifications out to the subscribers of each family.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from typing import Any
+
+import psycopg
+from prometheus_client import Gauge
+
+from app.config import settings
+from app.core.db import libpq_conninfo
+
+CHANNEL = "family_events"
+
+FAMILY_EVENT_SUBSCRIBERS = Gauge(
+    "family_event_subscribers",
+    "Open family event subscriptions.",
+    multiprocess_mode="livesum",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FamilyEventBroker:
+    """
+    Fans family_events notifications out to per-family subscriber queues.
+
+    Events only tell subscribers that a family's lists or tasks changed, so a
+    subscriber that falls behind loses its oldest events rather than slowing
+    down the others. After the listener reconnects every subscriber receives
+    a resync event, since notifications sent in between are lost.
+    """
+
+    def __init__(
+        self,
+        conninfo: str,
+        *,
+        queue_size: int = 100,
+        reconnect_delay: float = 1.0,
+        connect_timeout: float = 5.0,
+    ) -> None:
+        self.conninfo = conninfo
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self.connect_timeout = connect_timeout
+        self._subscribers: defaultdict[
+            uuid.UUID, set[asyncio.Queue[dict[str, Any]]]
+        ] = defaultdict(set)
+        self._listening = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @contextlib.asynccontextmanager
+    async def subscribe(
+        self, family_id: uuid.UUID
+    ) -> AsyncIterator[asyncio.Queue[dict[str, Any]]]:
+        """
+        Yields a queue receiving the family's events. It is only yielded once
+        the listener is connected, so no write committed afterwards is missed.
+        Raises TimeoutError if it doesn't connect within connect_timeout.
+        """
+
+        if self._task is None or self._task.done():
+            self._listening = asyncio.Event()
+            self._task = asyncio.create_task(self._listen())
+
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(self.queue_size)
+        self._subscribers[family_id].add(queue)
+        FAMILY_EVENT_SUBSCRIBERS.inc()
+        try:
+            await asyncio.wait_for(self._listening.wait(), self.connect_timeout)
+            yield queue
+        finally:
+            FAMILY_EVENT_SUBSCRIBERS.dec()
+            self._subscribers[family_id].discard(queue)
+            if not self._subscribers[family_id]:
+                del self._subscribers[family_id]
+
+    def dispatch(self, payload: str) -> None:
+        """
+        Delivers a notification payload to the subscribers of its family.
+        Malformed payloads are logged and dropped.
+        """
+
+        try:
+            event = json.loads(payload)
+            family_id = uuid.UUID(event["family_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Dropping malformed family event: %r", payload)
+            return
+        for queue in self._subscribers.get(family_id, ()):
+            self._put(queue, event)
+
+    def _put(self, queue: asyncio.Queue[dict[str, Any]], event: dict[str, Any]) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def _listen(self) -> None:
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    if connected_before:
+                        for family_id, queues in self._subscribers.items():
+                            for queue in queues:
+                                self._put(
+                                    queue,
+                                    {"type": "resync", "family_id": str(family_id)},
+                                )
+                    connected_before = True
+                    self._listening.set()
+                    async for notify in conn.notifies():
+                        self.dispatch(notify.payload)
+            except Exception:
+                logger.warning("Family event listener disconnected", exc_info=True)
+            # New subscribers wait for the reconnection, rather than getting
+            # a queue no event reaches
+            self._listening.clear()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def close(self) -> None:
+        """
+        Stops the listener and closes its connection.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+family_events = FamilyEventBroker(
+    libpq_conninfo(),
+    queue_size=settings.FAMILY_EVENTS_QUEUE_SIZE,
+    connect_timeout=settings.FAMILY_EVENTS_CONNECT_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,193 @@
+"""
+Request metrics and their Prometheus exposition.
+
+Requests are labelled with the unique id of the route they matched, as built
+by custom_generate_unique_id, e.g. "tasks-read_tasks", so the label set stays
+bounded whatever the path parameters are.
+
+Running several workers needs PROMETHEUS_MULTIPROC_DIR pointing to an empty
+directory shared by the workers, set before they start. Every metric is then
+written there and render_metrics aggregates them across the workers.
+"""
+
+import logging
+import os
+import time
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.db import QueryStats, query_stats
+
+# Label of requests that matched no route, e.g. a 404 or a 405
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds",
+    "Time spent handling requests, until the response is sent.",
+    ["route", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+HTTP_RESPONSES = Counter(
+    "http_responses",
+    "Responses sent, by status code.",
+    ["route", "method", "status"],
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements run per request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+logger = logging.getLogger(__name__)
+
+
+def route_label(scope: Scope) -> str:
+    """
+    Returns the unique id of the route the request matched.
+    """
+
+    route = scope.get("route")
+    return getattr(route, "unique_id", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the duration, status code and concurrency of
+    every HTTP request.
+
+    The route is only known once the router has matched it, so the labels
+    are read from the scope after the request has been handled.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = route_label(scope)
+            HTTP_REQUEST_SECONDS.labels(route=route, method=method).observe(
+                time.perf_counter() - start
+            )
+            HTTP_RESPONSES.labels(route=route, method=method, status=status).inc()
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware collecting the SQL statements run for each request.
+
+    Their number and total duration are recorded per route, and returned in
+    the Server-Timing and X-DB-Queries headers when DB_QUERY_HEADERS is on.
+    A statement repeated more than DB_REPEATED_QUERY_LIMIT times, typically
+    an N+1 over a relationship, is logged as a warning.
+
+    Statements run after the response has started, e.g. by a streaming
+    response, are missing from the headers but not from the metrics.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope=scope)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.db_query_headers:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"',
+                )
+                headers.append("X-DB-Queries", str(stats.count))
+            await send(message)
+
+        token = query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            query_stats.reset(token)
+            route = route_label(scope)
+            HTTP_REQUEST_DB_QUERIES.labels(route=route).observe(stats.count)
+            warn_repeated_queries(route, stats)
+
+
+def warn_repeated_queries(route: str, stats: QueryStats) -> None:
+    """
+    Logs the statements a request ran more than DB_REPEATED_QUERY_LIMIT times.
+    """
+
+    limit = settings.DB_REPEATED_QUERY_LIMIT
+    if not limit:
+        return
+    for shape, count in stats.shapes.items():
+        if count > limit:
+            logger.warning(
+                "%s ran the same statement %s times: %s", route, count, shape
+            )
+
+
+def multiprocess_dir() -> str | None:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def render_metrics() -> bytes:
+    """
+    Returns every metric in the Prometheus text format, aggregated across the
+    workers when running in multiprocess mode.
+    """
+
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    """
+    Drops the live gauges of this worker from the multiprocess directory, so
+    a worker that exits doesn't leave its in-flight requests behind.
+    """
+
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
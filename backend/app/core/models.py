@@ -3,7 +3,8 @@ from datetime import datetime
 from typing import TypedDict
 
 from pydantic import EmailStr
-from sqlmodel import Field, Relationship, SQLModel
+from sqlalchemy import BigInteger
+from sqlmodel import Field, Index, Relationship, SQLModel
 
 from app.core.utils import generate_invite_code
 
@@ -15,7 +16,11 @@ class FamilyBase(SQLModel):
 
     name: str = Field(min_length=1, max_length=255)
     invite_code: str = Field(
-        default_factory=generate_invite_code, min_length=8, max_length=8
+        default_factory=generate_invite_code,
+        min_length=8,
+        max_length=8,
+        unique=True,
+        index=True,
     )
 
 
@@ -26,8 +31,18 @@ class Family(FamilyBase, table=True):
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
 
-    members: list["User"] = Relationship(back_populates="family", cascade_delete=True)
-    lists: list["List"] = Relationship(back_populates="family", cascade_delete=True)
+    # Bumped by triggers whenever the family's lists or their tasks change,
+    # see the add_owner_versions migration. Never written by the application.
+    version: int = Field(default=0, sa_type=BigInteger)
+
+    # The children are deleted by the foreign keys' ON DELETE CASCADE rather
+    # than loaded and deleted one by one by the session
+    members: list["User"] = Relationship(
+        back_populates="family", cascade_delete=True, passive_deletes=True
+    )
+    lists: list["List"] = Relationship(
+        back_populates="family", cascade_delete=True, passive_deletes=True
+    )
 
 
 class FamilyPublic(FamilyBase):
@@ -70,14 +85,23 @@ class User(UserBase, table=True):
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Bumped by triggers whenever the user's personal lists or their tasks
+    # change. Never written by the application.
+    version: int = Field(default=0, sa_type=BigInteger)
 
     family_id: uuid.UUID | None = Field(
-        default=None, foreign_key="family.id", ondelete="CASCADE"
+        default=None, foreign_key="family.id", ondelete="CASCADE", index=True
     )
     family: Family | None = Relationship(back_populates="members")
 
-    tasks: list["Task"] = Relationship(back_populates="user", cascade_delete=True)
-    lists: list["List"] = Relationship(back_populates="user", cascade_delete=True)
+    tasks: list["Task"] = Relationship(
+        back_populates="user", cascade_delete=True, passive_deletes=True
+    )
+    lists: list["List"] = Relationship(
+        back_populates="user", cascade_delete=True, passive_deletes=True
+    )
 
 
 class UsersPublic(SQLModel):
@@ -86,7 +110,10 @@ class UsersPublic(SQLModel):
     """
 
     data: list[UserPublic]
-    count: int
+    # None when read with with_count=false
+    count: int | None = None
+    has_more: bool = False
+    next_cursor: str | None = None
 
 
 class ListBase(SQLModel):
@@ -128,18 +155,28 @@ class List(ListBase, table=True):
     """
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set by a trigger on every write, see the add_sync_tracking migration
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Maintained by triggers on the task table, see the add_list_task_counters
+    # migration. Never written by the application.
+    open_count: int = 0
+    completed_count: int = 0
 
     user_id: uuid.UUID | None = Field(
-        default=None, foreign_key="user.id", ondelete="CASCADE"
+        default=None, foreign_key="user.id", ondelete="CASCADE", index=True
     )
     user: User | None = Relationship(back_populates="lists")
 
     family_id: uuid.UUID | None = Field(
-        default=None, foreign_key="family.id", ondelete="CASCADE"
+        default=None, foreign_key="family.id", ondelete="CASCADE", index=True
     )
     family: Family | None = Relationship(back_populates="lists")
 
-    tasks: list["Task"] = Relationship(back_populates="list", cascade_delete=True)
+    tasks: list["Task"] = Relationship(
+        back_populates="list", cascade_delete=True, passive_deletes=True
+    )
 
 
 class ListPublic(ListBase):
@@ -157,6 +194,8 @@ class ListDisplay(ListBase):
 
     id: uuid.UUID
     task_count: int
+    open_count: int
+    completed_count: int
 
 
 class ListsPublic(SQLModel):
@@ -165,7 +204,10 @@ class ListsPublic(SQLModel):
     """
 
     data: list[ListDisplay]
-    count: int
+    # None when read with with_count=false
+    count: int | None = None
+    has_more: bool = False
+    next_cursor: str | None = None
 
 
 class TaskBase(SQLModel):
@@ -203,6 +245,41 @@ class TaskCreate(TaskBase):
     list_id: uuid.UUID
 
 
+class TaskIds(SQLModel):
+    """
+    Class for the ids of the tasks a bulk operation applies to.
+    """
+
+    ids: list[uuid.UUID] = Field(min_length=1)
+
+
+class TasksStatusUpdate(TaskIds):
+    """
+    Class for updating the status of many tasks.
+    """
+
+    completed: bool
+
+
+class TaskBulkResult(SQLModel):
+    """
+    Class for the outcome of a bulk operation for a single task.
+    """
+
+    id: uuid.UUID
+    status: str = Field(
+        description="One of updated, deleted, not_found, forbidden or incomplete"
+    )
+
+
+class TasksBulkResult(SQLModel):
+    """
+    Class for the per-task outcomes of a bulk operation.
+    """
+
+    data: list[TaskBulkResult]
+
+
 class Task(TaskBase, table=True):
     """
     Database  model for List
@@ -210,22 +287,139 @@ class Task(TaskBase, table=True):
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set by a trigger on every write, see the add_sync_tracking migration
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE")
+    user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
     user: User = Relationship(back_populates="tasks")
 
     list_id: uuid.UUID = Field(foreign_key="list.id", ondelete="CASCADE")
     list: List = Relationship(back_populates="tasks")
 
 
+# Serves both the list_id lookups and the newest-first keyset pagination of
+# read_list_tasks, which orders by (created_at, id) descending.
+Index(
+    "ix_task_list_id_created_at_id",
+    Task.list_id,
+    Task.created_at.desc(),
+    Task.id.desc(),
+)
+# Serves the per-list updated_at lookups of read_changes.
+Index("ix_task_list_id_updated_at", Task.list_id, Task.updated_at)
+
+
+class TaskDisplay(TaskPublic):
+    """
+    Class for display task data to be returned via API.
+    """
+
+    created_at: datetime
+    updated_at: datetime
+    user_id: uuid.UUID
+    list_id: uuid.UUID
+
+
 class TasksPublic(SQLModel):
     """
     Class for display lists data to be returned via API.
     """
 
-    data: list[Task]
-    count: int
+    data: list[TaskDisplay]
+    # None when read with with_count=false
+    count: int | None = None
+    has_more: bool = False
+    next_cursor: str | None = None
+
+
+class TaskArchive(TaskBase, table=True):
+    """
+    Database model for a completed task moved out of the task table by
+    archive_tasks. Partitioned by month of created_at, see the
+    add_task_archive and add_task_archive_default_partition migrations.
+    """
+
+    __tablename__ = "task_archive"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+
+    id: uuid.UUID = Field(primary_key=True)
+    # Part of the primary key, which has to include the partition key
+    created_at: datetime = Field(primary_key=True)
+    updated_at: datetime
+    archived_at: datetime
+
+    user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
+    list_id: uuid.UUID = Field(foreign_key="list.id", ondelete="CASCADE")
+
+
+Index(
+    "ix_task_archive_created_at_brin",
+    TaskArchive.created_at,
+    postgresql_using="brin",
+)
+# Serves read_archived_tasks, newest first like read_list_tasks
+Index(
+    "ix_task_archive_list_id_created_at_id",
+    TaskArchive.list_id,
+    TaskArchive.created_at.desc(),
+    TaskArchive.id.desc(),
+)
+# Serves the selection of aged completed tasks in archive_completed_tasks
+Index(
+    "ix_task_completed_updated_at",
+    Task.updated_at,
+    postgresql_where=Task.completed,
+)
+
+
+class ArchivedTaskDisplay(TaskDisplay):
+    """
+    Class for archived task data to be returned via API.
+    """
+
+    archived_at: datetime
+
+
+class ArchivedTasksPublic(SQLModel):
+    """
+    Class for archived tasks data to be returned via API.
+    """
+
+    data: list[ArchivedTaskDisplay]
+    # None when read with with_count=false
+    count: int | None = None
+    has_more: bool = False
+    next_cursor: str | None = None
+
+
+class Tombstone(SQLModel, table=True):
+    """
+    Database model for a deleted task or list, written by triggers. user_id or
+    family_id is the owner of the list the row belonged to.
+    """
+
+    id: uuid.UUID = Field(primary_key=True)
+    kind: str = Field(max_length=4)
+    user_id: uuid.UUID | None = None
+    family_id: uuid.UUID | None = None
+    deleted_at: datetime = Field(index=True)
+
+
+Index("ix_tombstone_user_id_deleted_at", Tombstone.user_id, Tombstone.deleted_at)
+Index("ix_tombstone_family_id_deleted_at", Tombstone.family_id, Tombstone.deleted_at)
+
+
+class Changes(SQLModel):
+    """
+    Class for the lists and tasks changed since a sync token, to be returned
+    via API. Pass token as since to fetch the next changes.
+    """
+
+    lists: list[List]
+    tasks: list[Task]
+    deleted_list_ids: list[uuid.UUID]
+    deleted_task_ids: list[uuid.UUID]
+    token: str
 
 
 class Token(SQLModel):
@@ -253,6 +447,15 @@ class Message(SQLModel):
     message: str
 
 
+class Cursor(TypedDict):
+    """
+    Class typing the decoded keyset pagination cursor.
+    """
+
+    created_at: datetime
+    id: uuid.UUID
+
+
 class UserRelationship(TypedDict):
     """
     Class typing the user relationship data.
@@ -1,8 +1,14 @@
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, TypeVar
 
 import jwt
 from passlib.context import CryptContext
+from prometheus_client import Counter, Gauge, Histogram
 
 from app.config import settings
 
@@ -11,6 +17,34 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+T = TypeVar("T")
+
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending",
+    "Password hash operations queued or running in the hashing pool.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time from submitting a password hash operation until it completed.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected",
+    "Password hash operations rejected because the hashing pool was full.",
+    ["operation"],
+)
+
+_hash_executor: ProcessPoolExecutor | None = None
+_hash_pending = 0
+
+
+class PasswordHasherBusyError(Exception):
+    """
+    Raised when too many password hash operations are already pending.
+    """
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     """
@@ -37,3 +71,70 @@ def get_password_hash(password: str) -> str:
     """
 
     return pwd_context.hash(password)
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    """
+    Returns the process pool used for bcrypt, starting it on first use.
+    """
+
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """
+    Stops the hashing pool's worker processes, if it was started. It is
+    started again on next use.
+    """
+
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True, cancel_futures=True)
+        _hash_executor = None
+
+
+async def _run_in_hash_pool(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Runs a bcrypt operation in the hashing pool, rejecting it if the number of
+    pending operations in this process has reached PASSWORD_HASH_MAX_PENDING.
+    """
+
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        PASSWORD_HASH_REJECTED.labels(operation=fn.__name__).inc()
+        raise PasswordHasherBusyError("Too many pending password hash operations")
+
+    _hash_pending += 1
+    PASSWORD_HASH_PENDING.inc()
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), fn, *args)
+    finally:
+        _hash_pending -= 1
+        PASSWORD_HASH_PENDING.dec()
+        PASSWORD_HASH_SECONDS.labels(operation=fn.__name__).observe(
+            time.perf_counter() - start
+        )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a plain password against a hashed password in the hashing pool.
+    """
+
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hashes a plain password using bcrypt in the hashing pool.
+    """
+
+    return await _run_in_hash_pool(get_password_hash, password)
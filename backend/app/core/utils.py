@@ -1,5 +1,11 @@
+import base64
+import hashlib
+import json
 import secrets
 import string
+import uuid
+from datetime import datetime
+from typing import Any
 
 
 def generate_invite_code(length=8):
@@ -8,3 +14,57 @@ def generate_invite_code(length=8):
     characters = string.ascii_letters + string.digits
     invite_code = "".join(secrets.choice(characters) for _ in range(length))
     return invite_code
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+
+    payload = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode an opaque cursor, raising ValueError if it is malformed."""
+
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(payload)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_sync_token(at: datetime) -> str:
+    """Encode the time a sync starts from as an opaque token."""
+
+    return base64.urlsafe_b64encode(at.isoformat().encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> datetime:
+    """Decode an opaque sync token, raising ValueError if it is malformed."""
+
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        return datetime.fromisoformat(payload.decode())
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid sync token") from e
+
+
+def make_etag(version: int, *parts: Any) -> str:
+    """Build a strong ETag from a version and whatever else shapes the body."""
+
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
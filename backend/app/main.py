@@ -1,17 +1,37 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.routes import metrics
 from app.config import settings
+from app.core import security
+from app.core.events import family_events
+from app.core.metrics import (
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    mark_process_dead,
+)
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    await family_events.close()
+    security.shutdown_hash_executor()
+    mark_process_dead()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
 )
@@ -25,4 +45,10 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+# Added last to be the outermost middlewares and time everything else
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix=settings.API_STR)
+# Served outside of API_STR, where Prometheus scrapes by default
+app.include_router(metrics.router, tags=["metrics"])
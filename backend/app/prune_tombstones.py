@@ -0,0 +1,23 @@
+import logging
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.config import settings
+from app.core import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    before = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    logger.info("Deleting tombstones older than %s", before)
+    with Session(engine) as session:
+        deleted = crud.delete_tombstones(session=session, before=before)
+    logger.info("Deleted %s tombstones", deleted)
+
+
+if __name__ == "__main__":
+    main()
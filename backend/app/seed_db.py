@@ -0,0 +1,298 @@
+import argparse
+import logging
+import math
+import multiprocessing
+import random
+import time
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import psycopg
+
+from app.core import security
+from app.core.db import libpq_conninfo
+from app.core.utils import generate_invite_code
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COLORS = ["#3B82F6", "#EF4444", "#10B981", "#F59E0B", "#8B5CF6", "#EC4899"]
+FAMILY_LIST_NAMES = ["Groceries", "Chores", "Errands", "Holidays", "Garden"]
+PERSONAL_LIST_NAMES = ["Personal", "Work", "Reading", "Gifts", "Fitness"]
+
+FAMILY_COLUMNS = "id, name, invite_code"
+USER_COLUMNS = "id, email, name, is_admin, hashed_password, created_at, family_id"
+LIST_COLUMNS = "id, name, is_family_list, color, created_at, user_id, family_id"
+TASK_COLUMNS = "id, title, notes, completed, created_at, user_id, list_id"
+
+
+@dataclass
+class SeedConfig:
+    """
+    Shape of the generated data.
+    """
+
+    # Relative weights of family sizes, e.g. {1: 15, 2: 25, 3: 20}
+    family_sizes: dict[int, float]
+    family_lists: float
+    personal_lists: float
+    tasks_per_list: float
+    # Sigma of the log-normal number of tasks per list; higher is more skewed
+    task_skew: float
+    completion_ratio: float
+    history_days: int
+    hashed_passwords: list[str]
+    run: str
+
+
+def parse_weights(value: str) -> dict[int, float]:
+    """
+    Parses "size:weight,size:weight" into a dict.
+    """
+
+    weights = {}
+    for item in value.split(","):
+        size, weight = item.split(":")
+        weights[int(size)] = float(weight)
+    return weights
+
+
+def poisson(rng: random.Random, mean: float) -> int:
+    """
+    Draws from a Poisson distribution with the given mean.
+    """
+
+    limit, k, p = math.exp(-mean), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def task_count(rng: random.Random, config: SeedConfig) -> int:
+    """
+    Draws the number of tasks of a list from a log-normal distribution with
+    mean tasks_per_list, so most lists are short and a few are very long.
+    """
+
+    if config.tasks_per_list <= 0:
+        return 0
+    sigma = config.task_skew
+    mu = math.log(config.tasks_per_list) - sigma**2 / 2
+    return int(rng.lognormvariate(mu, sigma))
+
+
+def generate_family(
+    rng: random.Random, config: SeedConfig, number: int, now: datetime
+) -> Iterator[tuple[str, tuple]]:
+    """
+    Generates the rows of one family as (table, row) pairs, in an order that
+    satisfies the foreign keys.
+    """
+
+    def created_at() -> datetime:
+        return now - timedelta(seconds=rng.uniform(0, config.history_days * 86400))
+
+    family_id = uuid.uuid4()
+    yield "family", (family_id, f"Family {number}", generate_invite_code())
+
+    size = rng.choices(list(config.family_sizes), list(config.family_sizes.values()))
+    members = []
+    for member in range(size[0]):
+        user_id = uuid.uuid4()
+        members.append(user_id)
+        yield (
+            "user",
+            (
+                user_id,
+                f"seed-{config.run}-{number}-{member}@example.com",
+                f"Member {member}",
+                member == 0,
+                config.hashed_passwords[member % len(config.hashed_passwords)],
+                created_at(),
+                family_id,
+            ),
+        )
+
+    lists = []
+    for index in range(1 + poisson(rng, config.family_lists - 1)):
+        list_id = uuid.uuid4()
+        lists.append(list_id)
+        yield (
+            "list",
+            (
+                list_id,
+                FAMILY_LIST_NAMES[index % len(FAMILY_LIST_NAMES)],
+                True,
+                rng.choice(COLORS),
+                created_at(),
+                None,
+                family_id,
+            ),
+        )
+    for user_id in members:
+        for index in range(1 + poisson(rng, config.personal_lists - 1)):
+            list_id = uuid.uuid4()
+            lists.append(list_id)
+            yield (
+                "list",
+                (
+                    list_id,
+                    PERSONAL_LIST_NAMES[index % len(PERSONAL_LIST_NAMES)],
+                    False,
+                    rng.choice(COLORS),
+                    created_at(),
+                    user_id,
+                    None,
+                ),
+            )
+
+    for list_id in lists:
+        for index in range(task_count(rng, config)):
+            yield (
+                "task",
+                (
+                    uuid.uuid4(),
+                    f"Task {index}",
+                    None,
+                    rng.random() < config.completion_ratio,
+                    created_at(),
+                    rng.choice(members),
+                    list_id,
+                ),
+            )
+
+
+def seed_chunk(
+    conninfo: str, config: SeedConfig, first: int, count: int, seed: int
+) -> dict[str, int]:
+    """
+    Generates families first to first + count - 1 and bulk loads them with
+    COPY in a single transaction. Returns the number of rows per table.
+    """
+
+    rng = random.Random(seed + first)
+    now = datetime.utcnow()
+    rows: dict[str, list[tuple]] = {"family": [], "user": [], "list": [], "task": []}
+    for number in range(first, first + count):
+        for table, row in generate_family(rng, config, number, now):
+            rows[table].append(row)
+
+    columns = {
+        "family": FAMILY_COLUMNS,
+        "user": USER_COLUMNS,
+        "list": LIST_COLUMNS,
+        "task": TASK_COLUMNS,
+    }
+    with psycopg.connect(conninfo) as conn, conn.cursor() as cursor:
+        for table, table_rows in rows.items():
+            with cursor.copy(f'COPY "{table}" ({columns[table]}) FROM STDIN') as copy:
+                for row in table_rows:
+                    copy.write_row(row)
+    return {table: len(table_rows) for table, table_rows in rows.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bulk load synthetic families, members, lists and tasks."
+    )
+    parser.add_argument("--families", type=int, default=1000)
+    parser.add_argument(
+        "--family-sizes",
+        type=parse_weights,
+        default="1:15,2:25,3:20,4:25,5:10,6:5",
+        help="relative weights of family sizes, as size:weight,...",
+    )
+    parser.add_argument(
+        "--family-lists", type=float, default=3, help="mean lists per family"
+    )
+    parser.add_argument(
+        "--personal-lists", type=float, default=2, help="mean lists per member"
+    )
+    parser.add_argument(
+        "--tasks-per-list", type=float, default=60, help="mean tasks per list"
+    )
+    parser.add_argument(
+        "--task-skew",
+        type=float,
+        default=1.2,
+        help="sigma of the log-normal tasks per list, higher is more skewed",
+    )
+    parser.add_argument("--completion-ratio", type=float, default=0.6)
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument(
+        "--passwords",
+        type=int,
+        default=4,
+        help="size of the pool of pre-hashed passwords password0, password1, ...",
+    )
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument(
+        "--chunk-size", type=int, default=500, help="families per transaction"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    # bcrypt is slow on purpose, so hash a small pool once instead of per user
+    hashed_passwords = [
+        security.get_password_hash(f"password{number}")
+        for number in range(args.passwords)
+    ]
+    config = SeedConfig(
+        family_sizes=args.family_sizes,
+        family_lists=args.family_lists,
+        personal_lists=args.personal_lists,
+        tasks_per_list=args.tasks_per_list,
+        task_skew=args.task_skew,
+        completion_ratio=args.completion_ratio,
+        history_days=args.history_days,
+        hashed_passwords=hashed_passwords,
+        run=uuid.uuid4().hex[:8],
+    )
+    conninfo = libpq_conninfo()
+
+    logger.info(
+        "Seeding %s families with %s workers, run %s. Member n of a family has "
+        "the password password{n %% %s}",
+        args.families,
+        args.workers,
+        config.run,
+        args.passwords,
+    )
+    start = time.perf_counter()
+    totals = {"family": 0, "user": 0, "list": 0, "task": 0}
+    with ProcessPoolExecutor(
+        args.workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(
+                seed_chunk,
+                conninfo,
+                config,
+                first,
+                min(args.chunk_size, args.families - first),
+                args.seed,
+            )
+            for first in range(0, args.families, args.chunk_size)
+        ]
+        for future in as_completed(futures):
+            for table, count in future.result().items():
+                totals[table] += count
+            logger.info("Loaded %s/%s families", totals["family"], args.families)
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "Loaded %s families, %s users, %s lists and %s tasks in %.1fs",
+        totals["family"],
+        totals["user"],
+        totals["list"],
+        totals["task"],
+        elapsed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Latency and throughput benchmark of the API routes.
+
+A dataset is seeded through app.core.crud, then every route in ROUTES is
+driven with concurrent requests, either in process through the ASGI app or
+against a running server given with --url. The p50/p95/p99 latency and the
+requests per second of each route are printed and can be written to a JSON
+baseline, which a later run can be compared against:
+
+    python -m benchmarks.api --output baseline.json
+    python -m benchmarks.api --compare baseline.json --threshold 0.2
+
+The seeded rows are left in the database, so point it at a disposable one.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+import anyio
+import httpx
+from sqlmodel import Session
+
+from app.config import settings
+from app.core import crud, security
+from app.core.db import engine
+from app.core.models import ListCreate, TaskCreate, UserCreate
+from app.main import app
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+# One line per request would drown the report
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+@dataclass
+class Actor:
+    """
+    A seeded user and the ids its requests refer to.
+    """
+
+    headers: dict[str, str]
+    user_id: uuid.UUID
+    family_id: uuid.UUID
+    personal_list_id: uuid.UUID
+    family_list_id: uuid.UUID
+    task_ids: list[uuid.UUID]
+
+
+# Route name -> function building (method, path, json body) for an actor
+ROUTES: dict[str, Callable[[Actor], tuple[str, str, Any]]] = {
+    "GET /users/me": lambda actor: ("GET", "/users/me", None),
+    "GET /lists/personal": lambda actor: ("GET", "/lists/personal", None),
+    "GET /lists/family": lambda actor: ("GET", "/lists/family", None),
+    "GET /tasks/{list_id}": lambda actor: (
+        "GET",
+        f"/tasks/{actor.family_list_id}",
+        None,
+    ),
+    "GET /families/{family_id}/members": lambda actor: (
+        "GET",
+        f"/families/{actor.family_id}/members",
+        None,
+    ),
+    "GET /sync": lambda actor: ("GET", "/sync/", None),
+    "POST /tasks": lambda actor: (
+        "POST",
+        "/tasks/",
+        {
+            "title": "Benchmark task",
+            "user_id": str(actor.user_id),
+            "list_id": str(actor.personal_list_id),
+        },
+    ),
+    "PATCH /tasks/status": lambda actor: (
+        "PATCH",
+        "/tasks/status",
+        {"ids": [str(id) for id in actor.task_ids[:10]], "completed": True},
+    ),
+}
+
+
+def seed(session: Session, *, families: int, members: int, tasks: int) -> list[Actor]:
+    """
+    Creates families of members, each with a personal list, and a family list
+    per family, every list holding the given number of tasks.
+    """
+
+    run = uuid.uuid4().hex[:8]
+    # A single hash for everyone, bcrypt would dominate the seeding time
+    hashed_password = security.get_password_hash(run)
+    actors = []
+    for family_number in range(families):
+        users = [
+            crud.create_user(
+                session=session,
+                user_create=UserCreate(
+                    email=f"bench-{run}-{family_number}-{number}@example.com",
+                    password=run,
+                ),
+                hashed_password=hashed_password,
+            )
+            for number in range(members)
+        ]
+        family = crud.create_family_with_admin(
+            session=session,
+            db_user=users[0],
+            name=f"Benchmark {run} {family_number}",
+            family_list_in=ListCreate(name="Family", is_family_list=True),
+            personal_list_in=ListCreate(name="Personal"),
+        )
+        for user in users[1:]:
+            crud.join_family_with_list(
+                session=session,
+                db_user=user,
+                db_family=family,
+                personal_list_in=ListCreate(name="Personal"),
+            )
+
+        family_list = crud.read_family_lists(session=session, family_id=family.id)
+        family_list_id = family_list.data[0].id
+        _ = crud.create_tasks(
+            session=session,
+            tasks_in=[
+                TaskCreate(
+                    title=f"Family task {number}",
+                    user_id=users[number % members].id,
+                    list_id=family_list_id,
+                    completed=number % 3 == 0,
+                )
+                for number in range(tasks)
+            ],
+        )
+        for user in users:
+            personal_lists = crud.read_personal_lists(session=session, user_id=user.id)
+            personal_list_id = personal_lists.data[0].id
+            personal_tasks = crud.create_tasks(
+                session=session,
+                tasks_in=[
+                    TaskCreate(
+                        title=f"Personal task {number}",
+                        user_id=user.id,
+                        list_id=personal_list_id,
+                        completed=number % 3 == 0,
+                    )
+                    for number in range(tasks)
+                ],
+            )
+            token = security.create_access_token(user.id, timedelta(hours=1))
+            actors.append(
+                Actor(
+                    headers={"Authorization": f"Bearer {token}"},
+                    user_id=user.id,
+                    family_id=family.id,
+                    personal_list_id=personal_list_id,
+                    family_list_id=family_list_id,
+                    task_ids=[task.id for task in personal_tasks],
+                )
+            )
+    return actors
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int) -> dict[str, Any]:
+    """
+    Returns the request count, error count, successful requests per second and
+    the p50, p95 and p99 latencies in milliseconds of one route. latencies only
+    holds the successful requests, so fast failures don't flatter the route;
+    the percentiles are None if there is none.
+    """
+
+    summary = {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": None,
+        "p95_ms": None,
+        "p99_ms": None,
+    }
+    if latencies:
+        # quantiles needs two samples
+        percentiles = (
+            statistics.quantiles(latencies, n=100, method="inclusive")
+            if len(latencies) > 1
+            else latencies * 99
+        )
+        summary["p50_ms"] = round(percentiles[49] * 1000, 2)
+        summary["p95_ms"] = round(percentiles[94] * 1000, 2)
+        summary["p99_ms"] = round(percentiles[98] * 1000, 2)
+    return summary
+
+
+async def bench_route(
+    client: httpx.AsyncClient,
+    build_request: Callable[[Actor], tuple[str, str, Any]],
+    actors: list[Actor],
+    *,
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """
+    Sends requests to one route from concurrency workers, cycling through the
+    actors, and summarizes the latencies.
+    """
+
+    latencies: list[float] = []
+    errors = 0
+    numbers = itertools.count()
+
+    async def worker() -> None:
+        nonlocal errors
+        while (number := next(numbers)) < requests:
+            actor = actors[number % len(actors)]
+            method, path, body = build_request(actor)
+            start = time.perf_counter()
+            response = await client.request(
+                method, f"{settings.API_STR}{path}", headers=actor.headers, json=body
+            )
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as task_group:
+        for _ in range(concurrency):
+            task_group.start_soon(worker)
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def run(
+    actors: list[Actor],
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int = 10,
+    url: str | None = None,
+    routes: list[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Benchmarks every route, or the given ones, and returns their summaries by
+    route name.
+    """
+
+    if url:
+        transport = httpx.AsyncHTTPTransport()
+        base_url = url
+    else:
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://benchmark"
+
+    results = {}
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, follow_redirects=True, timeout=60
+    ) as client:
+        for name in routes or ROUTES:
+            if warmup:
+                await bench_route(
+                    client, ROUTES[name], actors, requests=warmup, concurrency=1
+                )
+            results[name] = await bench_route(
+                client,
+                ROUTES[name],
+                actors,
+                requests=requests,
+                concurrency=concurrency,
+            )
+    return results
+
+
+def compare(
+    baseline: dict[str, dict[str, Any]],
+    results: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """
+    Returns a description of every route that failed any request, and of every
+    route whose p95 latency grew, or whose requests per second dropped, by
+    more than threshold relative to the baseline.
+    """
+
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if result["errors"]:
+            regressions.append(
+                f"{name}: {result['errors']} errors"
+                + (f" (baseline {base.get('errors', 0)})" if base else "")
+            )
+        if base is None or result["p95_ms"] is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {base['p95_ms']}ms -> {result['p95_ms']}ms"
+            )
+        if result["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{name}: rps {base['rps']} -> {result['rps']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the API routes.")
+    parser.add_argument("--families", type=int, default=20)
+    parser.add_argument("--members", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=50, help="tasks per list")
+    parser.add_argument("--requests", type=int, default=500, help="per route")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--route", action="append", choices=list(ROUTES))
+    parser.add_argument("--url", help="benchmark a running server instead")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed relative regression of p95 latency and rps",
+    )
+    args = parser.parse_args()
+
+    logger.info("Seeding %s families of %s members", args.families, args.members)
+    with Session(engine) as session:
+        actors = seed(
+            session, families=args.families, members=args.members, tasks=args.tasks
+        )
+
+    results = anyio.run(
+        lambda: run(
+            actors,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            url=args.url,
+            routes=args.route,
+        )
+    )
+    for name, result in results.items():
+        logger.info(
+            "%-36s p50 %8sms  p95 %8sms  p99 %8sms  %8.1f req/s  %s errors",
+            name,
+            result["p50_ms"],
+            result["p95_ms"],
+            result["p99_ms"],
+            result["rps"],
+            result["errors"],
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            logger.error("Regression in %s", regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+CPU cost of encoding list and task responses.
+
+Compares, per response, FastAPI's default path for a returned model, which
+validates it again against the route's response_model and encodes it through
+jsonable_encoder and json.dumps, with app.api.deps.json_response, which
+encodes the model built by the crud function once:
+
+    python -m benchmarks.serialization --tasks 100
+
+No database is needed, the models are built in memory.
+"""
+
+import argparse
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+import anyio
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlmodel import SQLModel
+
+from app.api.deps import json_response
+from app.core.models import List, ListDisplay, ListsPublic, TaskDisplay, TasksPublic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def tasks_page(size: int) -> TasksPublic:
+    user_id, list_id, now = uuid.uuid4(), uuid.uuid4(), datetime.utcnow()
+    tasks = [
+        TaskDisplay(
+            id=uuid.uuid4(),
+            title=f"Task {number}",
+            notes="Some notes",
+            completed=number % 3 == 0,
+            user_id=user_id,
+            list_id=list_id,
+            created_at=now,
+            updated_at=now,
+        )
+        for number in range(size)
+    ]
+    return TasksPublic(data=tasks, count=size)
+
+
+def lists_page(size: int) -> ListsPublic:
+    user_id = uuid.uuid4()
+    lists = [
+        ListDisplay.model_validate(
+            List(
+                name=f"List {number}",
+                user_id=user_id,
+                open_count=number,
+                completed_count=1,
+            ),
+            update={"task_count": number + 1},
+        )
+        for number in range(size)
+    ]
+    return ListsPublic(data=lists, count=size)
+
+
+Encoder = Callable[[], Awaitable[bytes]]
+
+
+def default_encode(model: SQLModel) -> Encoder:
+    """
+    Returns a function encoding model the way FastAPI does for a route
+    returning it with response_model set to its type.
+    """
+
+    field = create_model_field(
+        name=f"Response_{type(model).__name__}",
+        type_=type(model),
+        mode="serialization",
+    )
+
+    async def encode() -> bytes:
+        content = await serialize_response(
+            field=field, response_content=model, is_coroutine=True
+        )
+        return JSONResponse(content).body
+
+    return encode
+
+
+def direct_encode(model: SQLModel) -> Encoder:
+    """
+    Returns a function encoding model with json_response.
+    """
+
+    async def encode() -> bytes:
+        return json_response(Response(), model).body
+
+    return encode
+
+
+async def cpu_ms(encode: Encoder, repeat: int) -> float:
+    """
+    Returns the CPU time of one call of encode, in milliseconds.
+    """
+
+    await encode()
+    start = time.process_time()
+    for _ in range(repeat):
+        await encode()
+    return (time.process_time() - start) / repeat * 1000
+
+
+async def run(size: int, repeat: int) -> dict[str, dict[str, float]]:
+    """
+    Measures both encodings of a page of size tasks and of size lists.
+    """
+
+    results = {}
+    for name, model in (
+        ("TasksPublic", tasks_page(size)),
+        ("ListsPublic", lists_page(size)),
+    ):
+        default, direct = default_encode(model), direct_encode(model)
+        assert json.loads(await default()) == json.loads(await direct())
+        default_ms = await cpu_ms(default, repeat)
+        direct_ms = await cpu_ms(direct, repeat)
+        results[name] = {
+            "default_ms": round(default_ms, 3),
+            "direct_ms": round(direct_ms, 3),
+            "saved_ms": round(default_ms - direct_ms, 3),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the CPU time of encoding list and task responses."
+    )
+    parser.add_argument("--tasks", type=int, default=100, help="items per page")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    results = anyio.run(run, args.tasks, args.repeat)
+    for name, result in results.items():
+        logger.info(
+            "%-12s default %7.3fms  direct %7.3fms  saved %7.3fms CPU per response",
+            name,
+            result["default_ms"],
+            result["direct_ms"],
+            result["saved_ms"],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import pytest
+from app.api.routes import families
 from app.config import settings
 from app.core import crud
+from app.core.events import FamilyEventBroker
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
@@ -105,3 +108,37 @@ def test_read_family_members(db: Session, client: TestClient) -> None:
     assert r.status_code == 200
     content = r.json()
     assert content["count"] == 2
+
+
+def test_read_family_events_another_family(db: Session, client: TestClient) -> None:
+    user, password = register_random_user(db)
+    family = crud.create_family(session=db, name=random_lower_string())
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    r = client.get(f"{settings.API_STR}/families/{family.id}/events", headers=headers)
+    assert r.status_code == 403
+    assert (
+        r.json()["detail"]
+        == "Not enough permissions to access another family's events."
+    )
+
+
+def test_read_family_events_unavailable(
+    db: Session, client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user, password = register_random_user(db)
+    family = crud.create_family(session=db, name=random_lower_string())
+    _ = crud.join_family(session=db, db_user=user, family_id=family.id)
+    broker = FamilyEventBroker(
+        "host=127.0.0.1 port=1", reconnect_delay=0.05, connect_timeout=0.1
+    )
+    monkeypatch.setattr(families, "family_events", broker)
+
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    try:
+        r = client.get(
+            f"{settings.API_STR}/families/{family.id}/events", headers=headers
+        )
+    finally:
+        client.portal.call(broker.close)
+    assert r.status_code == 503
+    assert r.json()["detail"] == "Family events are unavailable, try again later."
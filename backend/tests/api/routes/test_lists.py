@@ -0,0 +1,151 @@
+import pytest
+from app.api import deps
+from app.config import settings
+from app.core.cache import MemoryResponseCache
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from tests.utils import (
+    assert_max_queries,
+    authenticate_user,
+    count_queries,
+    create_random_personal_list,
+    create_random_task,
+    register_random_user,
+)
+
+
+def test_read_personal_lists_not_modified(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+
+    response = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    with count_queries(db) as queries:
+        response = client.get(
+            f"{settings.API_STR}/lists/personal",
+            headers={**headers, "If-None-Match": etag},
+        )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not any("FROM list" in statement for statement in queries)
+
+    _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    response = client.get(
+        f"{settings.API_STR}/lists/personal",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["data"][0]["open_count"] == 1
+
+
+def test_read_personal_lists_etag_depends_on_query(
+    client: TestClient, db: Session
+) -> None:
+    user, password = register_random_user(db)
+    _ = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+
+    response = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+    etag = response.headers["ETag"]
+    response = client.get(
+        f"{settings.API_STR}/lists/personal",
+        headers={**headers, "If-None-Match": etag},
+        params={"limit": 1},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_read_personal_lists_response_cache(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    uncached = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+
+    monkeypatch.setattr(
+        deps, "response_cache", MemoryResponseCache("test", max_bytes=1 << 20)
+    )
+    response = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+    assert response.json() == uncached.json()
+    with count_queries(db) as queries:
+        response = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"] == uncached.headers["ETag"]
+    assert response.json() == uncached.json()
+    assert not any("FROM list" in statement for statement in queries)
+
+    _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    response = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+    assert response.json()["data"][0]["open_count"] == 1
+
+
+def test_read_personal_lists_query_count(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    for _ in range(5):
+        personal_list = create_random_personal_list(db=db, user_id=user.id)
+        _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+
+    # The user, the ETag version and the counted page of lists
+    with assert_max_queries(db, 3):
+        response = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+    assert response.json()["count"] == 5
+
+
+def test_read_personal_lists_without_count(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    for _ in range(3):
+        _ = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+
+    response = client.get(
+        f"{settings.API_STR}/lists/personal",
+        headers=headers,
+        params={"limit": 2, "with_count": False},
+    )
+    content = response.json()
+    assert content["count"] is None
+    assert content["has_more"] is True
+    assert len(content["data"]) == 2
+
+    response = client.get(
+        f"{settings.API_STR}/lists/personal", headers=headers, params={"limit": 2}
+    )
+    content = response.json()
+    assert content["count"] == 3
+    assert content["has_more"] is True
+
+
+def test_read_family_lists_without_family(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        deps, "response_cache", MemoryResponseCache("test", max_bytes=1 << 20)
+    )
+    user, password = register_random_user(db)
+    _ = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    response = client.get(f"{settings.API_STR}/lists/family", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+    assert response.json()["count"] == 0
+    assert "ETag" not in response.headers
+
+    other_user, other_password = register_random_user(db)
+    _ = create_random_personal_list(db=db, user_id=other_user.id)
+    other_headers = authenticate_user(
+        client=client, email=other_user.email, password=other_password
+    )
+    response = client.get(
+        f"{settings.API_STR}/lists/family",
+        headers={**other_headers, "If-None-Match": '"0"'},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == []
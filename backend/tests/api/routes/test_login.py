@@ -1,3 +1,4 @@
+import pytest
 from app.config import settings
 from fastapi.testclient import TestClient
 from sqlmodel import Session
@@ -34,3 +35,16 @@ def test_use_access_token(db: Session, client: TestClient) -> None:
     print(result)
     assert r.status_code == 200
     assert "email" in result
+
+
+def test_get_access_token_hasher_busy(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    login_data = {
+        "username": settings.TEST_USER,
+        "password": settings.TEST_USER_PASSWORD,
+    }
+    r = client.post(f"{settings.API_STR}/login/access-token", data=login_data)
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
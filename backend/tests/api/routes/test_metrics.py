@@ -0,0 +1,113 @@
+import logging
+
+import pytest
+from app.config import settings
+from app.core.db import QueryStats
+from app.core.metrics import warn_repeated_queries
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlmodel import Session
+
+from tests.utils import authenticate_user, register_random_user
+
+
+def responses(route: str, method: str, status: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "http_responses_total",
+            {"route": route, "method": method, "status": status},
+        )
+        or 0.0
+    )
+
+
+def test_metrics_by_route(client: TestClient) -> None:
+    before = responses("ping-ping", "GET", "200")
+    response = client.get(f"{settings.API_STR}/ping/")
+    assert response.status_code == 200
+    assert responses("ping-ping", "GET", "200") == before + 1
+
+    assert (
+        REGISTRY.get_sample_value(
+            "http_request_seconds_count", {"route": "ping-ping", "method": "GET"}
+        )
+        >= 1
+    )
+
+
+def test_metrics_status_codes(client: TestClient) -> None:
+    before = responses("users-read_user_me", "GET", "401")
+    response = client.get(f"{settings.API_STR}/users/me")
+    assert response.status_code == 401
+    assert responses("users-read_user_me", "GET", "401") == before + 1
+
+
+def test_metrics_unmatched_route(client: TestClient) -> None:
+    before = responses("unmatched", "GET", "404")
+    response = client.get(f"{settings.API_STR}/does-not-exist/12345")
+    assert response.status_code == 404
+    assert responses("unmatched", "GET", "404") == before + 1
+
+
+def test_metrics_endpoint(client: TestClient) -> None:
+    _ = client.get(f"{settings.API_STR}/ping/")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_responses_total{method="GET",route="ping-ping",status="200"}' in (
+        response.text
+    )
+    assert "http_requests_in_progress" in response.text
+    assert "db_pool_checked_out" in response.text
+
+
+def test_metrics_endpoint_token(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    response = client.get("/metrics")
+    assert response.status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert "http_requests_in_progress" in response.text
+
+
+def test_metrics_endpoint_disabled_outside_local(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    response = client.get("/metrics")
+    assert response.status_code == 404
+
+
+def test_query_stats_headers(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "DB_QUERY_HEADERS", True)
+    user, password = register_random_user(db)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    response = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) >= 1
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    monkeypatch.setattr(settings, "DB_QUERY_HEADERS", False)
+    response = client.get(f"{settings.API_STR}/lists/personal", headers=headers)
+    assert "X-DB-Queries" not in response.headers
+    assert "Server-Timing" not in response.headers
+
+
+def test_repeated_queries_warning(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(settings, "DB_REPEATED_QUERY_LIMIT", 2)
+    stats = QueryStats(count=4)
+    stats.shapes["SELECT list"] = 1
+    stats.shapes["SELECT task WHERE list_id = %(list_id_1)s"] = 3
+    with caplog.at_level(logging.WARNING, logger="app.core.metrics"):
+        warn_repeated_queries("lists-read_personal_lists", stats)
+    assert len(caplog.records) == 1
+    assert "3 times" in caplog.records[0].getMessage()
+    assert "SELECT task" in caplog.records[0].getMessage()
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.core.utils import encode_sync_token
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from tests.utils import (
+    authenticate_user,
+    create_random_personal_list,
+    create_random_task,
+    register_random_user,
+)
+
+
+def test_read_changes(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    task = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+
+    response = client.get(f"{settings.API_STR}/sync", headers=headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert [db_list["id"] for db_list in content["lists"]] == [str(personal_list.id)]
+    assert [db_task["id"] for db_task in content["tasks"]] == [str(task.id)]
+
+    response = client.get(
+        f"{settings.API_STR}/sync",
+        headers=headers,
+        params={"since": content["token"]},
+    )
+    assert response.status_code == 200
+    assert response.json()["tasks"] == []
+
+    new_task = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    response = client.get(
+        f"{settings.API_STR}/sync",
+        headers=headers,
+        params={"since": content["token"]},
+    )
+    assert [db_task["id"] for db_task in response.json()["tasks"]] == [str(new_task.id)]
+
+
+def test_read_changes_invalid_token(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    response = client.get(
+        f"{settings.API_STR}/sync", headers=headers, params={"since": "not-a-token"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid sync token"
+
+
+def test_read_changes_expired_token(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    since = datetime.utcnow() - timedelta(
+        days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1
+    )
+    response = client.get(
+        f"{settings.API_STR}/sync",
+        headers=headers,
+        params={"since": encode_sync_token(since)},
+    )
+    assert response.status_code == 410
@@ -168,3 +168,233 @@ def test_delete_task(client: TestClient, db: Session) -> None:
     content = response.json()
     assert response.status_code == 200
     assert content["message"] == "Task deleted successfully"
+
+
+def test_read_archived_tasks(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    task = create_random_task(
+        db=db, user_id=user.id, list_id=personal_list.id, completed=True
+    )
+    task_id = str(task.id)
+    _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    crud.clear_list_tasks(session=db, list_id=personal_list.id)
+
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    response = client.get(
+        f"{settings.API_STR}/tasks/{personal_list.id}/archive", headers=headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 1
+    assert [archived["id"] for archived in content["data"]] == [task_id]
+    assert content["data"][0]["archived_at"]
+
+    other_user, other_password = register_random_user(db)
+    headers = authenticate_user(
+        client=client, email=other_user.email, password=other_password
+    )
+    response = client.get(
+        f"{settings.API_STR}/tasks/{personal_list.id}/archive", headers=headers
+    )
+    assert response.status_code == 403
+
+
+def test_read_tasks_cursor_pagination(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    for _ in range(3):
+        _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+
+    response = client.get(
+        f"{settings.API_STR}/tasks/{personal_list.id}",
+        headers=headers,
+        params={"limit": 2},
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["data"]) == 2
+    assert first_page["next_cursor"]
+
+    response = client.get(
+        f"{settings.API_STR}/tasks/{personal_list.id}",
+        headers=headers,
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page["data"]) == 1
+    assert second_page["next_cursor"] is None
+    assert second_page["data"][0]["id"] not in {
+        task["id"] for task in first_page["data"]
+    }
+
+
+def test_read_tasks_invalid_cursor(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    response = client.get(
+        f"{settings.API_STR}/tasks/{personal_list.id}",
+        headers=headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_create_tasks_batch(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    data = [
+        {
+            "title": random_lower_string(),
+            "user_id": str(user.id),
+            "list_id": str(personal_list.id),
+        }
+        for _ in range(1000)
+    ]
+    response = client.post(
+        f"{settings.API_STR}/tasks/batch", headers=headers, json=data
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [task["title"] for task in content] == [task["title"] for task in data]
+    tasks = crud.read_list_tasks(session=db, list_id=personal_list.id)
+    assert tasks.count == 1000
+
+
+def test_create_tasks_batch_multiple_lists(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    list_1 = create_random_personal_list(db=db, user_id=user.id)
+    list_2 = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    data = [
+        {
+            "title": random_lower_string(),
+            "user_id": str(user.id),
+            "list_id": str(list_id),
+        }
+        for list_id in (list_1.id, list_2.id)
+    ]
+    response = client.post(
+        f"{settings.API_STR}/tasks/batch", headers=headers, json=data
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "All tasks must belong to the same list"
+
+
+def test_create_tasks_batch_assign_regular_user(
+    client: TestClient, db: Session
+) -> None:
+    user_1, password = register_random_user(db)
+    user_2, _ = register_random_user(db)
+    family = crud.create_family(session=db, name=random_lower_string())
+    _ = crud.join_family(session=db, db_user=user_1, family_id=family.id)
+    _ = crud.join_family(session=db, db_user=user_2, family_id=family.id)
+    family_list = create_random_family_list(db=db, family_id=family.id)
+    headers = authenticate_user(client=client, email=user_1.email, password=password)
+    data = [
+        {
+            "title": random_lower_string(),
+            "user_id": str(user_id),
+            "list_id": str(family_list.id),
+        }
+        for user_id in (user_1.id, user_2.id)
+    ]
+    response = client.post(
+        f"{settings.API_STR}/tasks/batch", headers=headers, json=data
+    )
+    assert response.status_code == 403
+    assert (
+        response.json()["detail"] == "Not enough permissions to assign tasks to others"
+    )
+
+
+def test_update_tasks_status(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    other_user, _ = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    other_list = create_random_personal_list(db=db, user_id=other_user.id)
+    own_tasks = [
+        create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+        for _ in range(3)
+    ]
+    other_task = create_random_task(db=db, user_id=other_user.id, list_id=other_list.id)
+    missing_id = uuid.uuid4()
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    data = {
+        "ids": [str(task.id) for task in own_tasks]
+        + [str(other_task.id), str(missing_id)],
+        "completed": True,
+    }
+    response = client.patch(
+        f"{settings.API_STR}/tasks/status", headers=headers, json=data
+    )
+    assert response.status_code == 200
+    statuses = {result["id"]: result["status"] for result in response.json()["data"]}
+    assert statuses == {
+        **{str(task.id): "updated" for task in own_tasks},
+        str(other_task.id): "forbidden",
+        str(missing_id): "not_found",
+    }
+    for task in own_tasks:
+        db.refresh(task)
+        assert task.completed is True
+    db.refresh(other_task)
+    assert other_task.completed is False
+
+
+def test_delete_tasks(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    completed_task = create_random_task(
+        db=db, user_id=user.id, list_id=personal_list.id, completed=True
+    )
+    incomplete_task = create_random_task(
+        db=db, user_id=user.id, list_id=personal_list.id
+    )
+    completed_task_id = completed_task.id
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    data = {"ids": [str(completed_task_id), str(incomplete_task.id)]}
+    response = client.request(
+        "DELETE", f"{settings.API_STR}/tasks/", headers=headers, json=data
+    )
+    assert response.status_code == 200
+    statuses = {result["id"]: result["status"] for result in response.json()["data"]}
+    assert statuses == {
+        str(completed_task_id): "deleted",
+        str(incomplete_task.id): "incomplete",
+    }
+    db.expire_all()
+    assert crud.read_task_by_id(session=db, id=completed_task_id) is None
+    assert crud.read_task_by_id(session=db, id=incomplete_task.id)
+
+
+def test_read_tasks_not_modified(client: TestClient, db: Session) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    task = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+
+    response = client.get(
+        f"{settings.API_STR}/tasks/{personal_list.id}", headers=headers
+    )
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        f"{settings.API_STR}/tasks/{personal_list.id}",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+    crud.update_task_status(session=db, db_task=task, completed=True)
+    response = client.get(
+        f"{settings.API_STR}/tasks/{personal_list.id}",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"][0]["completed"] is True
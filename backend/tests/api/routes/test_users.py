@@ -2,6 +2,7 @@ import uuid
 
 from app.config import settings
 from app.core import crud, security
+from app.core.cache import principal_cache
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
@@ -25,6 +26,29 @@ def test_get_users_me(db: Session, client: TestClient) -> None:
     assert current_user["email"] == user.email
 
 
+def test_get_users_me_uses_principal_cache(db: Session, client: TestClient) -> None:
+    user, password = register_random_user(db)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    response = client.get(f"{settings.API_STR}/users/me", headers=headers)
+    assert response.status_code == 200
+    hits = principal_cache.hits
+    response = client.get(f"{settings.API_STR}/users/me", headers=headers)
+    assert response.status_code == 200
+    assert principal_cache.hits == hits + 1
+
+
+def test_get_users_me_after_join_family(db: Session, client: TestClient) -> None:
+    user, password = register_random_user(db)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+    response = client.get(f"{settings.API_STR}/users/me", headers=headers)
+    assert response.json()["family_id"] is None
+
+    family = crud.create_family(session=db, name=random_lower_string())
+    _ = crud.join_family(session=db, db_user=user, family_id=family.id)
+    response = client.get(f"{settings.API_STR}/users/me", headers=headers)
+    assert response.json()["family_id"] == str(family.id)
+
+
 def test_register_user(db: Session, client: TestClient) -> None:
     email = random_email()
     password = random_lower_string()
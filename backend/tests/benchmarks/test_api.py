@@ -0,0 +1,54 @@
+import pytest
+from benchmarks.api import ROUTES, compare, run, seed, summarize
+from sqlmodel import Session
+
+
+def test_summarize() -> None:
+    latencies = [number / 1000 for number in range(1, 101)]
+    summary = summarize(latencies, elapsed=2.0, errors=1)
+    assert summary["requests"] == 101
+    assert summary["errors"] == 1
+    assert summary["rps"] == 50.0
+    assert summary["p50_ms"] == pytest.approx(50.5)
+    assert summary["p99_ms"] == pytest.approx(99.01)
+
+
+def test_summarize_leaves_errors_out_of_latencies() -> None:
+    summary = summarize([0.01], elapsed=1.0, errors=3)
+    assert summary["requests"] == 4
+    assert summary["errors"] == 3
+    assert summary["rps"] == 1.0
+    assert summary["p95_ms"] == 10.0
+
+    summary = summarize([], elapsed=1.0, errors=2)
+    assert summary["rps"] == 0.0
+    assert summary["p50_ms"] is None
+
+
+def test_compare() -> None:
+    baseline = {
+        "GET /a": {"p95_ms": 10.0, "rps": 100.0, "errors": 0},
+        "GET /b": {"p95_ms": 10.0, "rps": 100.0, "errors": 0},
+        "GET /c": {"p95_ms": 10.0, "rps": 100.0, "errors": 0},
+    }
+    results = {
+        "GET /a": {"p95_ms": 11.0, "rps": 95.0, "errors": 0},
+        "GET /b": {"p95_ms": 13.0, "rps": 70.0, "errors": 0},
+        # Faster, but failing
+        "GET /c": {"p95_ms": 1.0, "rps": 900.0, "errors": 5},
+        "GET /new": {"p95_ms": None, "rps": 0.0, "errors": 1},
+    }
+    assert compare(baseline, results, threshold=0.2) == [
+        "GET /b: p95 10.0ms -> 13.0ms",
+        "GET /b: rps 100.0 -> 70.0",
+        "GET /c: 5 errors (baseline 0)",
+        "GET /new: 1 errors",
+    ]
+
+
+@pytest.mark.anyio
+async def test_run(db: Session) -> None:
+    actors = seed(db, families=1, members=2, tasks=3)
+    results = await run(actors, requests=4, concurrency=2, warmup=0)
+    assert set(results) == set(ROUTES)
+    assert all(result["errors"] == 0 for result in results.values())
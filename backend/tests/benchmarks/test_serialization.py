@@ -0,0 +1,27 @@
+import json
+
+import pytest
+from benchmarks.serialization import (
+    default_encode,
+    direct_encode,
+    lists_page,
+    run,
+    tasks_page,
+)
+
+
+@pytest.mark.anyio
+async def test_encodings_match() -> None:
+    for model in (tasks_page(3), lists_page(3)):
+        default = json.loads(await default_encode(model)())
+        assert json.loads(await direct_encode(model)()) == default
+        assert len(default["data"]) == 3
+
+
+@pytest.mark.anyio
+async def test_run() -> None:
+    results = await run(5, repeat=2)
+    assert set(results) == {"TasksPublic", "ListsPublic"}
+    for result in results.values():
+        assert result["default_ms"] > 0
+        assert result["direct_ms"] > 0
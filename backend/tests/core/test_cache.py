@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from app.core.cache import MemoryResponseCache, NetworkResponseCache, TTLCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hit_and_miss_counters() -> None:
+    cache: TTLCache[str, int] = TTLCache("test", maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_cache_entries_expire() -> None:
+    timer = FakeTimer()
+    cache: TTLCache[str, int] = TTLCache("test", maxsize=10, ttl=60, timer=timer)
+    cache.set("a", 1)
+    timer.now = 59
+    assert cache.get("a") == 1
+    timer.now = 60
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_invalidate() -> None:
+    cache: TTLCache[str, int] = TTLCache("test", maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+
+def test_cache_disabled() -> None:
+    cache: TTLCache[str, int] = TTLCache("test", maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+class FakeNetworkClient:
+    """
+    Local stand-in for a Redis client.
+    """
+
+    def __init__(self) -> None:
+        self.store: dict[str, tuple[bytes, int | None]] = {}
+
+    async def get(self, name: str) -> bytes | None:
+        await asyncio.sleep(0)
+        entry = self.store.get(name)
+        return entry[0] if entry else None
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> None:
+        await asyncio.sleep(0)
+        self.store[name] = (value, ex)
+
+
+class BrokenNetworkClient:
+    async def get(self, name: str) -> bytes | None:
+        raise ConnectionError
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> None:
+        raise ConnectionError
+
+
+@pytest.mark.anyio
+async def test_memory_response_cache_evicts_by_size() -> None:
+    cache = MemoryResponseCache("test", max_bytes=10)
+    await cache.set("a", b"1234")
+    await cache.set("b", b"1234")
+    assert await cache.get("a") == b"1234"
+    await cache.set("c", b"1234")
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"1234"
+    assert cache.size == 8
+    await cache.set("d", b"x" * 11)
+    assert await cache.get("d") is None
+    assert len(cache) == 2
+
+
+@pytest.mark.anyio
+async def test_network_response_cache() -> None:
+    client = FakeNetworkClient()
+    cache = NetworkResponseCache("test", client, ttl=30, prefix="p:")
+    assert await cache.get("a") is None
+    await cache.set("a", b"body")
+    assert client.store == {"p:a": (b"body", 30)}
+    assert await cache.get("a") == b"body"
+
+
+@pytest.mark.anyio
+async def test_network_response_cache_errors_are_misses() -> None:
+    cache = NetworkResponseCache("test", BrokenNetworkClient(), ttl=30)
+    await cache.set("a", b"body")
+    assert await cache.get("a") is None
@@ -0,0 +1,175 @@
+import json
+import logging
+
+import pytest
+from app.config import settings
+from app.core import crud
+from app.core.db import QueryStats, engine, query_stats, statement_shape
+from prometheus_client import REGISTRY
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from tests.utils import (
+    authenticate_user,
+    create_random_personal_list,
+    create_random_task,
+    create_random_user,
+    register_random_user,
+)
+
+
+def sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name, {"engine": "sync"}) or 0.0
+
+
+def test_engine_uses_configured_pool() -> None:
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.pool._max_overflow == settings.DB_MAX_OVERFLOW
+    assert engine.pool._pre_ping is settings.DB_POOL_PRE_PING
+
+
+def test_pool_metrics() -> None:
+    checkouts = sample("db_pool_checkout_seconds_count")
+    connections = [engine.connect() for _ in range(settings.DB_POOL_SIZE + 1)]
+    try:
+        assert sample("db_pool_checked_out") == engine.pool.checkedout()
+        assert sample("db_pool_overflow") >= 1
+    finally:
+        for connection in connections:
+            connection.close()
+
+    assert sample("db_pool_checked_out") == engine.pool.checkedout()
+    assert sample("db_pool_overflow") == 0
+    assert sample("db_pool_checkout_seconds_count") == checkouts + len(connections)
+
+
+def test_pool_metrics_after_dispose() -> None:
+    checkouts = sample("db_pool_checkout_seconds_count")
+    engine.dispose()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert sample("db_pool_checked_out") == engine.pool.checkedout() == 1
+    assert sample("db_pool_checked_out") == 0
+    assert sample("db_pool_checkout_seconds_count") == checkouts + 1
+
+
+def test_statement_shape() -> None:
+    assert statement_shape(
+        "SELECT task.id\n  FROM task\n WHERE task.id IN (%(id_1_1)s, %(id_1_2)s)"
+    ) == statement_shape("SELECT task.id FROM task WHERE task.id IN (%(id_1_1)s)")
+    assert statement_shape("SELECT 1 WHERE %(x)s = 1") == ("SELECT 1 WHERE %(x)s = 1")
+
+
+def test_query_stats() -> None:
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        with engine.connect() as connection:
+            for value in range(3):
+                connection.execute(text("SELECT :value"), {"value": value})
+    finally:
+        query_stats.reset(token)
+
+    assert stats.count == 3
+    assert stats.seconds > 0
+    assert list(stats.shapes.values()) == [3]
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert stats.count == 3
+
+
+def slow_queries(caplog: pytest.LogCaptureFixture, table: str) -> list[dict]:
+    return [
+        record
+        for record in (
+            json.loads(log.getMessage())
+            for log in caplog.records
+            if log.name == "app.core.db.slow_queries"
+        )
+        if f"FROM {table}" in record["statement"]
+        or f"INTO {table}" in record["statement"]
+    ]
+
+
+@pytest.fixture
+def log_every_query(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_SECONDS", 1e-9)
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_EXPLAIN_RATE", 1.0)
+
+
+def test_slow_query_log(
+    db: Session, log_every_query: None, caplog: pytest.LogCaptureFixture
+) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.db.slow_queries"):
+        tasks = crud.read_list_tasks(session=db, list_id=personal_list.id)
+    assert tasks.count == 1
+
+    records = slow_queries(caplog, "task")
+    assert records
+    record = records[-1]
+    assert record["engine"] == "sync"
+    assert record["route"] is None
+    assert record["duration_ms"] >= 0
+    assert "UUID" in record["parameters"].values()
+    assert "Actual Total Time" in record["plan"][0]["Plan"]
+
+
+def test_slow_query_log_only_plans_writes(
+    db: Session, log_every_query: None, caplog: pytest.LogCaptureFixture
+) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.db.slow_queries"):
+        _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+
+    records = slow_queries(caplog, "task")
+    assert records
+    assert "Actual Total Time" not in records[0]["plan"][0]["Plan"]
+    assert crud.read_list_tasks(session=db, list_id=personal_list.id).count == 1
+
+
+def test_slow_query_log_route(
+    client: TestClient,
+    db: Session,
+    log_every_query: None,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    user, password = register_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    headers = authenticate_user(client=client, email=user.email, password=password)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.db.slow_queries"):
+        response = client.get(
+            f"{settings.API_STR}/tasks/{personal_list.id}", headers=headers
+        )
+    assert response.status_code == 200
+
+    records = slow_queries(caplog, "task")
+    assert records
+    assert {record["route"] for record in records} == {"tasks-read_tasks"}
+    assert all("plan" in record for record in records)
+
+
+def test_slow_query_log_plan_error(
+    db: Session, log_every_query: None, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.WARNING, logger="app.core.db.slow_queries"):
+        timezone = db.exec(text("SHOW TIME ZONE")).scalar_one()
+
+    records = [
+        json.loads(log.getMessage())
+        for log in caplog.records
+        if log.name == "app.core.db.slow_queries"
+    ]
+    assert records[-1]["statement"] == "SHOW TIME ZONE"
+    assert "plan" not in records[-1]
+    assert records[-1]["plan_error"]
+    # The failed EXPLAIN didn't abort the transaction
+    assert db.exec(text("SHOW TIME ZONE")).scalar_one() == timezone
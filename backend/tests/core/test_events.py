@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import AsyncGenerator
+
+import pytest
+from psycopg.conninfo import make_conninfo
+from anyio import to_thread
+from app.api.routes.families import stream_family_events
+from app.core import crud
+from app.core.events import FamilyEventBroker, family_events
+from sqlmodel import Session, text
+
+from tests.utils import create_random_family_list, random_lower_string
+
+
+@pytest.fixture
+async def broker() -> AsyncGenerator[FamilyEventBroker, None]:
+    # Each test runs in its own event loop, so don't share the listener
+    broker = FamilyEventBroker(family_events.conninfo)
+    yield broker
+    await broker.close()
+
+
+@pytest.mark.anyio
+async def test_family_events_follow_commits(
+    db: Session, broker: FamilyEventBroker
+) -> None:
+    family = crud.create_family(session=db, name=random_lower_string())
+    other_family = crud.create_family(session=db, name=random_lower_string())
+
+    async with broker.subscribe(family.id) as queue:
+        # Committed first, so it would be received first if it leaked through
+        _ = await to_thread.run_sync(
+            lambda: create_random_family_list(db=db, family_id=other_family.id)
+        )
+        family_list = await to_thread.run_sync(
+            lambda: create_random_family_list(db=db, family_id=family.id)
+        )
+        event = await asyncio.wait_for(queue.get(), 5)
+        assert event == {
+            "type": "list.insert",
+            "family_id": str(family.id),
+            "version": 1,
+        }
+
+        await to_thread.run_sync(
+            lambda: crud.delete_list(session=db, db_list=family_list)
+        )
+        event = await asyncio.wait_for(queue.get(), 5)
+        assert event == {
+            "type": "list.delete",
+            "family_id": str(family.id),
+            "version": 2,
+        }
+        assert queue.empty()
+
+
+@pytest.mark.anyio
+async def test_stream_family_events(db: Session, broker: FamilyEventBroker) -> None:
+    family = crud.create_family(session=db, name=random_lower_string())
+    stream = stream_family_events(broker, family.id)
+
+    assert await anext(stream) == "event: ready\ndata: {}\n\n"
+    _ = await to_thread.run_sync(
+        lambda: create_random_family_list(db=db, family_id=family.id)
+    )
+    message = await asyncio.wait_for(anext(stream), 5)
+    assert message.startswith("event: list.insert\ndata: ")
+    await stream.aclose()
+
+
+def test_dispatch_drops_malformed_payloads(caplog: pytest.LogCaptureFixture) -> None:
+    broker = FamilyEventBroker(family_events.conninfo)
+    family_id = uuid.uuid4()
+    queue: asyncio.Queue[dict] = asyncio.Queue()
+    broker._subscribers[family_id].add(queue)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.events"):
+        for payload in ("not json", "[]", "{}", '{"family_id": "not-a-uuid"}'):
+            broker.dispatch(payload)
+    assert len(caplog.records) == 4
+
+    event = {"type": "list.insert", "family_id": str(family_id), "version": 1}
+    broker.dispatch(json.dumps(event))
+    assert queue.get_nowait() == event
+    assert queue.empty()
+
+
+@pytest.mark.anyio
+async def test_subscribe_timeout() -> None:
+    broker = FamilyEventBroker(
+        "host=127.0.0.1 port=1", reconnect_delay=0.05, connect_timeout=0.1
+    )
+    family_id = uuid.uuid4()
+    try:
+        with pytest.raises(TimeoutError):
+            async with broker.subscribe(family_id):
+                pass
+        assert family_id not in broker._subscribers
+    finally:
+        await broker.close()
+
+
+async def next_event(queue: asyncio.Queue[dict]) -> dict:
+    """
+    Returns the next event of queue that isn't a resync.
+    """
+
+    while (event := await asyncio.wait_for(queue.get(), 5))["type"] == "resync":
+        pass
+    return event
+
+
+async def listener_down(broker: FamilyEventBroker) -> None:
+    while broker._listening.is_set():
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.anyio
+async def test_subscribe_during_listener_outage(db: Session) -> None:
+    application_name = f"test_events_{uuid.uuid4().hex[:8]}"
+    broker = FamilyEventBroker(
+        make_conninfo(family_events.conninfo, application_name=application_name),
+        reconnect_delay=0.5,
+    )
+    family = crud.create_family(session=db, name=random_lower_string())
+    try:
+        async with broker.subscribe(family.id) as queue:
+            db.exec(
+                text(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                    "WHERE application_name = :name"
+                ),
+                params={"name": application_name},
+            )
+            db.commit()
+            await asyncio.wait_for(listener_down(broker), 5)
+
+            # Only yielded once the listener is back
+            async with broker.subscribe(family.id) as late_queue:
+                assert broker._listening.is_set()
+                assert await asyncio.wait_for(queue.get(), 5) == {
+                    "type": "resync",
+                    "family_id": str(family.id),
+                }
+                _ = await to_thread.run_sync(
+                    lambda: create_random_family_list(db=db, family_id=family.id)
+                )
+                assert (await next_event(late_queue))["type"] == "list.insert"
+                assert (await next_event(queue))["type"] == "list.insert"
+    finally:
+        await broker.close()
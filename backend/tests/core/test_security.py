@@ -0,0 +1,38 @@
+import pytest
+from app.config import settings
+from app.core import security
+
+from tests.utils import random_lower_string
+
+
+@pytest.mark.anyio
+async def test_password_hash_async_roundtrip() -> None:
+    password = random_lower_string()
+    hashed_password = await security.get_password_hash_async(password)
+    assert hashed_password != password
+    assert await security.verify_password_async(password, hashed_password)
+    assert not await security.verify_password_async("incorrect", hashed_password)
+    assert security.verify_password(password, hashed_password)
+
+
+@pytest.mark.anyio
+async def test_password_hash_async_rejects_when_full(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    with pytest.raises(security.PasswordHasherBusyError):
+        await security.get_password_hash_async(random_lower_string())
+
+
+@pytest.mark.anyio
+async def test_shutdown_hash_executor() -> None:
+    password = random_lower_string()
+    hashed_password = await security.get_password_hash_async(password)
+    processes = list(security._get_hash_executor()._processes.values())
+    assert processes
+
+    security.shutdown_hash_executor()
+    assert security._hash_executor is None
+    assert not any(process.is_alive() for process in processes)
+    # Started again on next use
+    assert await security.verify_password_async(password, hashed_password)
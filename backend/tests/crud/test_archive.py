@@ -0,0 +1,166 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from app.api.deps import get_cursor
+from app.core import crud
+from app.core.db import engine
+from app.core.models import Task
+from sqlmodel import Session, select, text
+
+from tests.utils import (
+    count_queries,
+    create_random_personal_list,
+    create_random_task,
+    create_random_user,
+    random_lower_string,
+)
+
+
+def archived_rows(db: Session, partition: str, list_id: uuid.UUID) -> int:
+    return db.exec(
+        text(f"SELECT count(*) FROM {partition} WHERE list_id = :list_id"),
+        params={"list_id": list_id},
+    ).scalar_one()
+
+
+def test_clear_list_tasks_archives_completed_tasks(db: Session) -> None:
+    user = create_random_user(db)
+    list_id = create_random_personal_list(db=db, user_id=user.id).id
+    expected = [
+        create_random_task(
+            db=db, user_id=user.id, list_id=list_id, completed=True
+        ).model_dump()
+        for _ in range(3)
+    ][::-1]
+    open_task_id = create_random_task(db=db, user_id=user.id, list_id=list_id).id
+
+    with count_queries(db) as queries:
+        crud.clear_list_tasks(session=db, list_id=list_id)
+    # The DELETE ... RETURNING and INSERT into the archive are one statement
+    assert sum("DELETE FROM task" in statement for statement in queries) == 1
+
+    tasks = crud.read_list_tasks(session=db, list_id=list_id)
+    assert [task.id for task in tasks.data] == [open_task_id]
+
+    archived = crud.read_archived_tasks(session=db, list_id=list_id)
+    assert archived.count == 3
+    assert [
+        task.model_dump(exclude={"archived_at"}) for task in archived.data
+    ] == expected
+    assert all(task.archived_at for task in archived.data)
+
+    first_page = crud.read_archived_tasks(session=db, list_id=list_id, limit=2)
+    second_page = crud.read_archived_tasks(
+        session=db, list_id=list_id, cursor=get_cursor(first_page.next_cursor)
+    )
+    assert [task.id for task in first_page.data + second_page.data] == [
+        task["id"] for task in expected
+    ]
+
+
+def test_archive_tasks_in_batches_and_monthly_partitions(db: Session) -> None:
+    user = create_random_user(db)
+    list_id = create_random_personal_list(db=db, user_id=user.id).id
+    months = [datetime(2001, month, 15) for month in (1, 2, 3)]
+    for month in months:
+        db.exec(text(f"DROP TABLE IF EXISTS task_archive_p{month:%Y_%m}"))
+    db.add_all(
+        Task(
+            title=random_lower_string(),
+            completed=True,
+            user_id=user.id,
+            list_id=list_id,
+            created_at=created_at,
+        )
+        for created_at in months * 2
+    )
+    db.commit()
+
+    with count_queries(db) as queries:
+        archived = crud.archive_tasks(
+            session=db, where=Task.list_id == list_id, batch_size=4
+        )
+    assert archived == 6
+    assert not [statement for statement in queries if "CREATE" in statement]
+    assert crud.read_list_tasks(session=db, list_id=list_id).count == 0
+    assert crud.read_archived_tasks(session=db, list_id=list_id).count == 6
+    assert archived_rows(db, "task_archive_default", list_id) == 6
+
+    # The months' rows are moved out of the default partition
+    created = crud.create_task_archive_partitions(
+        session=db, before=datetime.utcnow(), months_ahead=0
+    )
+    assert created >= 3
+    assert archived_rows(db, "task_archive_default", list_id) == 0
+    for month in months:
+        assert archived_rows(db, f"task_archive_p{month:%Y_%m}", list_id) == 2
+    assert crud.read_archived_tasks(session=db, list_id=list_id).count == 6
+    assert (
+        crud.create_task_archive_partitions(
+            session=db, before=datetime.utcnow(), months_ahead=0
+        )
+        == 0
+    )
+
+
+def test_clear_list_tasks_waits_for_locked_tasks(db: Session) -> None:
+    user = create_random_user(db)
+    list_id = create_random_personal_list(db=db, user_id=user.id).id
+    task_id = create_random_task(
+        db=db, user_id=user.id, list_id=list_id, completed=True
+    ).id
+
+    with Session(engine) as other:
+        other.exec(select(Task).where(Task.id == task_id).with_for_update()).one()
+        # The background archiver leaves it for the next run
+        archived = crud.archive_tasks(
+            session=db, where=Task.list_id == list_id, skip_locked=True
+        )
+        assert archived == 0
+
+        def clear() -> None:
+            with Session(engine) as session:
+                crud.clear_list_tasks(session=session, list_id=list_id)
+
+        clearing = threading.Thread(target=clear)
+        clearing.start()
+        clearing.join(0.5)
+        assert clearing.is_alive()
+        other.commit()
+    clearing.join(5)
+    assert not clearing.is_alive()
+    archived = crud.read_archived_tasks(session=db, list_id=list_id)
+    assert [task.id for task in archived.data] == [task_id]
+
+
+def test_archive_completed_tasks(db: Session) -> None:
+    user = create_random_user(db)
+    list_id = create_random_personal_list(db=db, user_id=user.id).id
+    before = datetime.utcnow() - timedelta(days=1)
+    task_id = create_random_task(
+        db=db, user_id=user.id, list_id=list_id, completed=True
+    ).id
+
+    crud.archive_completed_tasks(session=db, before=before)
+    assert db.exec(select(Task.id).where(Task.id == task_id)).first() == task_id
+
+    crud.archive_completed_tasks(
+        session=db, before=datetime.utcnow() + timedelta(seconds=1)
+    )
+    assert db.exec(select(Task.id).where(Task.id == task_id)).first() is None
+    archived = crud.read_archived_tasks(session=db, list_id=list_id)
+    assert [task.id for task in archived.data] == [task_id]
+
+
+def test_archived_tasks_are_deleted_with_their_list(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    list_id = personal_list.id
+    _ = create_random_task(db=db, user_id=user.id, list_id=list_id, completed=True)
+    crud.clear_list_tasks(session=db, list_id=list_id)
+    assert crud.read_archived_tasks(session=db, list_id=list_id).count == 1
+
+    crud.delete_list(session=db, db_list=personal_list)
+    assert crud.read_archived_tasks(session=db, list_id=list_id).count == 0
+    assert crud.read_archived_tasks(session=db, list_id=uuid.uuid4()).count == 0
@@ -0,0 +1,77 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+from app.config import settings
+from app.core import crud, crud_async
+from app.core.models import UserCreate
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from tests.utils import (
+    create_random_personal_list,
+    create_random_task,
+    create_random_user,
+    random_lower_string,
+)
+
+
+@pytest.fixture
+async def async_db() -> AsyncGenerator[AsyncSession, None]:
+    # Each test runs in its own event loop, so don't share pooled connections
+    engine = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI), poolclass=NullPool
+    )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_read_list_tasks_with_async_session(
+    db: Session, async_db: AsyncSession
+) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    task = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    tasks = await crud_async.read_list_tasks(session=async_db, list_id=personal_list.id)
+    assert tasks.count == 1
+    assert tasks.data[0].id == task.id
+
+
+@pytest.mark.anyio
+async def test_create_family_with_async_session(
+    db: Session, async_db: AsyncSession
+) -> None:
+    family_name = random_lower_string()
+    family = await crud_async.create_family(session=async_db, name=family_name)
+    assert family.name == family_name
+    fetched_family = crud.read_family_by_id(session=db, id=family.id)
+    assert fetched_family
+    assert fetched_family.name == family_name
+
+
+@pytest.mark.anyio
+async def test_authenticate_with_async_session(async_db: AsyncSession) -> None:
+    user = await crud_async.create_user(
+        session=async_db,
+        user_create=UserCreate(
+            email=f"{random_lower_string()}@example.com",
+            password=random_lower_string(),
+        ),
+    )
+    assert (
+        await crud_async.authenticate(
+            session=async_db, email=user.email, password="wrong-password"
+        )
+        is None
+    )
+
+
+@pytest.mark.anyio
+async def test_crud_async_with_sync_session(db: Session) -> None:
+    user = create_random_user(db)
+    fetched_user = await crud_async.read_user_by_id(session=db, id=user.id)
+    assert fetched_user
+    assert fetched_user.id == user.id
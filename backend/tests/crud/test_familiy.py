@@ -1,8 +1,12 @@
+import pytest
+from app.api.deps import get_cursor
 from app.core import crud
+from app.core.models import Family, ListCreate, UserPublic
 from fastapi.encoders import jsonable_encoder
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from tests.utils import (
+    count_queries,
     create_random_family_list,
     create_random_user,
     random_lower_string,
@@ -41,6 +45,41 @@ def test_read_family_members(db: Session) -> None:
     assert members.count == 2
 
 
+def test_read_family_members_selects_public_columns(db: Session) -> None:
+    family = crud.create_family(session=db, name=random_lower_string())
+    user = create_random_user(db)
+    _ = crud.join_family(session=db, db_user=user, family_id=family.id)
+    family_id, email = family.id, user.email
+    db.expunge_all()
+
+    with count_queries(db) as queries:
+        members = crud.read_family_members(session=db, family_id=family_id)
+    assert [type(member) for member in members.data] == [UserPublic]
+    assert members.data[0].email == email
+    assert not any("hashed_password" in statement for statement in queries)
+    assert not db.identity_map
+
+
+def test_read_family_members_cursor_pagination(db: Session) -> None:
+    family = crud.create_family(session=db, name=random_lower_string())
+    created = []
+    for _ in range(3):
+        user = create_random_user(db)
+        _ = crud.join_family(session=db, db_user=user, family_id=family.id)
+        created.append(user.id)
+
+    first_page = crud.read_family_members(session=db, family_id=family.id, limit=2)
+    assert [user.id for user in first_page.data] == created[:2]
+    second_page = crud.read_family_members(
+        session=db,
+        family_id=family.id,
+        limit=2,
+        cursor=get_cursor(first_page.next_cursor),
+    )
+    assert [user.id for user in second_page.data] == created[2:]
+    assert second_page.next_cursor is None
+
+
 def test_join_family(db: Session) -> None:
     family_name = random_lower_string()
     family = crud.create_family(session=db, name=family_name)
@@ -50,6 +89,70 @@ def test_join_family(db: Session) -> None:
     assert updated_user.family_id == family.id
 
 
+def test_create_family_with_admin(db: Session) -> None:
+    user = create_random_user(db)
+    user_id = user.id
+    with count_queries(db) as queries:
+        family = crud.create_family_with_admin(
+            session=db,
+            db_user=user,
+            name=random_lower_string(),
+            family_list_in=ListCreate(name="Family", is_family_list=True),
+            personal_list_in=ListCreate(name="Personal"),
+        )
+    # Loading the expired user, one flush (family, user and both lists) and
+    # the refresh of the family.
+    assert len(queries) == 5
+    db.expire_all()
+    user = crud.read_user_by_id(session=db, id=user_id)
+    assert user.family_id == family.id
+    assert user.is_admin is True
+    assert crud.read_family_lists(session=db, family_id=family.id).count == 1
+    assert crud.read_personal_lists(session=db, user_id=user_id).count == 1
+
+
+def test_create_family_with_admin_is_atomic(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = create_random_user(db)
+    user_id = user.id
+    name = random_lower_string()
+
+    def fail(**_: object) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(crud, "create_list", fail)
+    with pytest.raises(RuntimeError):
+        crud.create_family_with_admin(
+            session=db,
+            db_user=user,
+            name=name,
+            family_list_in=ListCreate(name="Family", is_family_list=True),
+            personal_list_in=ListCreate(name="Personal"),
+        )
+    db.rollback()
+    assert db.exec(select(Family).where(Family.name == name)).first() is None
+    user = crud.read_user_by_id(session=db, id=user_id)
+    assert user.family_id is None
+    assert user.is_admin is False
+
+
+def test_join_family_with_list(db: Session) -> None:
+    family = crud.create_family(session=db, name=random_lower_string())
+    user = create_random_user(db)
+    user_id = user.id
+    joined_family = crud.join_family_with_list(
+        session=db,
+        db_user=user,
+        db_family=family,
+        personal_list_in=ListCreate(name="Personal"),
+    )
+    assert joined_family.id == family.id
+    db.expire_all()
+    assert crud.read_user_by_id(session=db, id=user_id).family_id == family.id
+    assert crud.read_personal_lists(session=db, user_id=user_id).count == 1
+
+
 def test_read_family_by_invite_code(db: Session) -> None:
     family_name = random_lower_string()
     family = crud.create_family(session=db, name=family_name)
@@ -1,9 +1,22 @@
+import uuid
+
+from app.api.deps import get_cursor
 from app.core import crud
-from app.core.models import ListCreate, ListUpdate
+from app.core.models import (
+    List,
+    ListCreate,
+    ListDisplay,
+    ListUpdate,
+    Task,
+    TaskArchive,
+    TaskCreate,
+    TaskDisplay,
+)
 from fastapi.encoders import jsonable_encoder
-from sqlmodel import Session
+from sqlmodel import Session, select, update
 
 from tests.utils import (
+    count_queries,
     create_random_admin_user,
     create_random_family_list,
     create_random_personal_list,
@@ -96,6 +109,47 @@ def test_read_family_lists(db: Session) -> None:
     assert lists.count == 2
 
 
+def test_read_personal_lists_task_counts(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    empty_list = create_random_personal_list(db=db, user_id=user.id)
+    _ = create_random_task(
+        db=db, user_id=user.id, list_id=personal_list.id, completed=True
+    )
+    _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    lists = crud.read_personal_lists(session=db, user_id=user.id)
+    counts = {
+        list_display.id: (
+            list_display.task_count,
+            list_display.open_count,
+            list_display.completed_count,
+        )
+        for list_display in lists.data
+    }
+    assert counts[personal_list.id] == (3, 2, 1)
+    assert counts[empty_list.id] == (0, 0, 0)
+
+
+def test_read_lists_query_count_is_constant(db: Session) -> None:
+    family = crud.create_family(session=db, name=random_lower_string())
+    user = create_random_user(db)
+    family_list = create_random_family_list(db=db, family_id=family.id)
+    _ = create_random_task(db=db, user_id=user.id, list_id=family_list.id)
+    family_id = family.id
+    with count_queries(db) as few_lists_queries:
+        crud.read_family_lists(session=db, family_id=family_id)
+
+    for _ in range(5):
+        family_list = create_random_family_list(db=db, family_id=family_id)
+        _ = create_random_task(db=db, user_id=user.id, list_id=family_list.id)
+    with count_queries(db) as many_lists_queries:
+        lists = crud.read_family_lists(session=db, family_id=family_id)
+
+    assert lists.count == 6
+    assert len(many_lists_queries) == len(few_lists_queries) == 1
+
+
 def test_read_list_tasks_newest_first(db: Session) -> None:
     user = create_random_user(db)
     list_name = random_lower_string()
@@ -112,6 +166,99 @@ def test_read_list_tasks_newest_first(db: Session) -> None:
     assert tasks.data[1].id == task_1.id
 
 
+def test_read_list_tasks_selects_public_columns(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    task = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    expected = task.model_dump()
+    user_id, list_id = user.id, personal_list.id
+    db.expunge_all()
+
+    tasks = crud.read_list_tasks(session=db, list_id=list_id)
+    assert [type(task) for task in tasks.data] == [TaskDisplay]
+    assert tasks.data[0].model_dump() == expected
+    lists = crud.read_personal_lists(session=db, user_id=user_id)
+    assert [type(display) for display in lists.data] == [ListDisplay]
+    assert lists.data[0].task_count == 1
+    assert not db.identity_map
+
+
+def test_read_list_tasks_cursor_pagination(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    created = [
+        create_random_task(db=db, user_id=user.id, list_id=personal_list.id).id
+        for _ in range(5)
+    ]
+    first_page = crud.read_list_tasks(session=db, list_id=personal_list.id, limit=2)
+    assert first_page.count == 5
+    assert first_page.next_cursor
+
+    seen = [task.id for task in first_page.data]
+    next_cursor = first_page.next_cursor
+    while next_cursor:
+        page = crud.read_list_tasks(
+            session=db,
+            list_id=personal_list.id,
+            limit=2,
+            cursor=get_cursor(next_cursor),
+        )
+        seen.extend(task.id for task in page.data)
+        next_cursor = page.next_cursor
+
+    assert seen == created[::-1]
+
+
+def test_read_list_tasks_count_modes(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    for _ in range(3):
+        _ = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    list_id = personal_list.id
+
+    with count_queries(db) as queries:
+        page = crud.read_list_tasks(session=db, list_id=list_id, limit=2)
+    assert len(queries) == 1
+    assert (page.count, page.has_more) == (3, True)
+
+    with count_queries(db) as queries:
+        page = crud.read_list_tasks(
+            session=db, list_id=list_id, limit=2, with_count=False
+        )
+    assert len(queries) == 1
+    assert "count(*)" not in queries[0]
+    assert (len(page.data), page.count, page.has_more) == (2, None, True)
+
+    # The window count doesn't see the rows before a cursor or past the end
+    page = crud.read_list_tasks(
+        session=db,
+        list_id=list_id,
+        limit=2,
+        cursor=get_cursor(page.next_cursor),
+    )
+    assert (len(page.data), page.count, page.has_more) == (1, 3, False)
+    page = crud.read_list_tasks(session=db, list_id=list_id, skip=5)
+    assert (page.data, page.count) == ([], 3)
+
+    empty_list_id = create_random_personal_list(db=db, user_id=user.id).id
+    with count_queries(db) as queries:
+        page = crud.read_list_tasks(session=db, list_id=empty_list_id)
+    assert len(queries) == 1
+    assert (page.data, page.count, page.has_more) == ([], 0, False)
+
+
+def test_read_personal_lists_cursor_pagination(db: Session) -> None:
+    user = create_random_user(db)
+    created = [create_random_personal_list(db=db, user_id=user.id).id for _ in range(3)]
+    first_page = crud.read_personal_lists(session=db, user_id=user.id, limit=2)
+    assert [list_display.id for list_display in first_page.data] == created[:2]
+    second_page = crud.read_personal_lists(
+        session=db, user_id=user.id, limit=2, cursor=get_cursor(first_page.next_cursor)
+    )
+    assert [list_display.id for list_display in second_page.data] == created[2:]
+    assert second_page.next_cursor is None
+
+
 def test_clear_list_tasks_keeps_uncompleted_tasks(db: Session) -> None:
     user = create_random_user(db)
     personal_list = create_random_personal_list(db=db, user_id=user.id)
@@ -178,6 +325,35 @@ def test_delete_list(db: Session) -> None:
     assert list_after_deletion is None
 
 
+def test_delete_list_in_batches(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    list_id = personal_list.id
+    _ = create_random_task(db=db, user_id=user.id, list_id=list_id, completed=True)
+    crud.clear_list_tasks(session=db, list_id=list_id)
+    for _ in range(5):
+        _ = create_random_task(db=db, user_id=user.id, list_id=list_id)
+
+    db_list = crud.read_list_by_id(session=db, id=list_id)
+    with count_queries(db) as statements:
+        crud.delete_list(session=db, db_list=db_list, batch_size=2)
+
+    task_deletes = [s for s in statements if s.startswith("DELETE FROM task ")]
+    archive_deletes = [
+        s for s in statements if s.startswith("DELETE FROM task_archive")
+    ]
+    assert len(task_deletes) == 3
+    assert len(archive_deletes) == 1
+    # The tasks are never loaded into the session
+    assert not [s for s in statements if s.startswith("SELECT task.")]
+    assert crud.read_list_by_id(session=db, id=list_id) is None
+    assert db.exec(select(Task.id).where(Task.list_id == list_id)).all() == []
+    assert (
+        db.exec(select(TaskArchive.id).where(TaskArchive.list_id == list_id)).all()
+        == []
+    )
+
+
 def test_read_list_by_id(db: Session) -> None:
     user = create_random_user(db)
     list_name = random_lower_string()
@@ -189,3 +365,97 @@ def test_read_list_by_id(db: Session) -> None:
     assert fetched_list.id == personal_list.id
     assert fetched_list.name == personal_list.name
     assert jsonable_encoder(personal_list) == jsonable_encoder(fetched_list)
+
+
+def read_list_counts(db: Session, list_id: uuid.UUID) -> tuple[int, int]:
+    db_list = crud.read_list_by_id(session=db, id=list_id)
+    db.refresh(db_list)
+    return db_list.open_count, db_list.completed_count
+
+
+def test_list_counts_follow_task_writes(db: Session) -> None:
+    user = create_random_user(db)
+    list_id = create_random_personal_list(db=db, user_id=user.id).id
+    task = create_random_task(db=db, user_id=user.id, list_id=list_id)
+    assert read_list_counts(db, list_id) == (1, 0)
+
+    tasks = crud.create_tasks(
+        session=db,
+        tasks_in=[
+            TaskCreate(title=random_lower_string(), user_id=user.id, list_id=list_id)
+            for _ in range(3)
+        ],
+    )
+    assert read_list_counts(db, list_id) == (4, 0)
+
+    crud.update_task_status(session=db, db_task=task, completed=True)
+    assert read_list_counts(db, list_id) == (3, 1)
+
+    crud.update_tasks_status(
+        session=db, ids=[task.id for task in tasks], completed=True
+    )
+    assert read_list_counts(db, list_id) == (0, 4)
+
+    crud.delete_task(session=db, db_task=task)
+    assert read_list_counts(db, list_id) == (0, 3)
+
+    crud.update_tasks_status(session=db, ids=[tasks[0].id], completed=False)
+    crud.clear_list_tasks(session=db, list_id=list_id)
+    assert read_list_counts(db, list_id) == (1, 0)
+
+
+def test_bulk_task_writes_without_ids(db: Session) -> None:
+    with count_queries(db) as statements:
+        crud.update_tasks_status(session=db, ids=[], completed=True)
+        crud.delete_tasks(session=db, ids=[])
+    assert statements == []
+
+
+def test_list_count_drift_repair(db: Session) -> None:
+    user = create_random_user(db)
+    list_id = create_random_personal_list(db=db, user_id=user.id).id
+    _ = create_random_task(db=db, user_id=user.id, list_id=list_id)
+    db.exec(
+        update(List).where(List.id == list_id).values(open_count=5, completed_count=2)
+    )
+    db.commit()
+
+    drift = crud.read_list_count_drift(session=db)
+    assert [
+        (row.open_count, row.actual_open_count) for row in drift if row.id == list_id
+    ] == [(5, 1)]
+
+    crud.repair_list_counts(session=db, ids=[list_id])
+    assert read_list_counts(db, list_id) == (1, 0)
+    assert list_id not in {row.id for row in crud.read_list_count_drift(session=db)}
+
+
+def test_owner_versions_follow_list_and_task_writes(db: Session) -> None:
+    user = create_random_user(db)
+    family = crud.create_family(session=db, name=random_lower_string())
+    user_id, family_id = user.id, family.id
+
+    def versions() -> tuple[int, int]:
+        return (
+            crud.read_user_version(session=db, id=user_id),
+            crud.read_family_version(session=db, id=family_id),
+        )
+
+    assert versions() == (0, 0)
+    personal_list = create_random_personal_list(db=db, user_id=user_id)
+    family_list = create_random_family_list(db=db, family_id=family_id)
+    assert versions() == (1, 1)
+
+    task = create_random_task(db=db, user_id=user_id, list_id=personal_list.id)
+    assert versions() == (2, 1)
+
+    crud.update_task_status(session=db, db_task=task, completed=True)
+    assert versions() == (3, 1)
+
+    crud.update_list(
+        session=db, db_list=family_list, list_in=ListUpdate(name=random_lower_string())
+    )
+    assert versions() == (3, 2)
+
+    crud.delete_list(session=db, db_list=personal_list)
+    assert versions() == (4, 2)
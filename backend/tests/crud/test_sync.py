@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+from app.core import crud
+from app.core.models import TaskUpdate, Tombstone
+from app.core.utils import decode_sync_token
+from sqlmodel import Session
+
+from tests.utils import (
+    create_random_family_list,
+    create_random_personal_list,
+    create_random_task,
+    create_random_user,
+    random_lower_string,
+)
+
+
+def test_update_task_bumps_updated_at(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    task = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    created_updated_at = task.updated_at
+
+    task = crud.update_task(
+        session=db,
+        db_task=task,
+        task_in=TaskUpdate(title=random_lower_string(), user_id=user.id),
+    )
+    assert task.updated_at > created_updated_at
+
+    updated_at = task.updated_at
+    crud.update_tasks_status(session=db, ids=[task.id], completed=True)
+    db.refresh(task)
+    assert task.updated_at > updated_at
+
+
+def test_read_changes(db: Session) -> None:
+    user = create_random_user(db)
+    family = crud.create_family(session=db, name=random_lower_string())
+    user = crud.join_family(session=db, db_user=user, family_id=family.id)
+    other_user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    family_list = create_random_family_list(db=db, family_id=family.id)
+    other_list = create_random_personal_list(db=db, user_id=other_user.id)
+    task = create_random_task(db=db, user_id=user.id, list_id=personal_list.id)
+    _ = create_random_task(db=db, user_id=other_user.id, list_id=other_list.id)
+
+    changes = crud.read_changes(session=db, user_id=user.id, family_id=family.id)
+    assert {db_list.id for db_list in changes.lists} == {
+        personal_list.id,
+        family_list.id,
+    }
+    assert [db_task.id for db_task in changes.tasks] == [task.id]
+    since = decode_sync_token(changes.token)
+    db.commit()
+
+    family_task = create_random_task(db=db, user_id=user.id, list_id=family_list.id)
+    deleted_task_id = task.id
+    crud.delete_task(session=db, db_task=task)
+    _ = create_random_task(db=db, user_id=other_user.id, list_id=other_list.id)
+
+    changes = crud.read_changes(
+        session=db, user_id=user.id, family_id=family.id, since=since
+    )
+    assert [db_task.id for db_task in changes.tasks] == [family_task.id]
+    # Both lists' counters changed
+    assert {db_list.id for db_list in changes.lists} == {
+        personal_list.id,
+        family_list.id,
+    }
+    assert changes.deleted_task_ids == [deleted_task_id]
+    assert changes.deleted_list_ids == []
+    db.commit()
+
+    family_list_id, family_task_id = family_list.id, family_task.id
+    crud.delete_list(session=db, db_list=family_list)
+    changes = crud.read_changes(
+        session=db, user_id=user.id, family_id=family.id, since=since
+    )
+    assert family_list_id in changes.deleted_list_ids
+    # The list's tombstone covers its tasks
+    assert family_task_id not in changes.deleted_task_ids
+    db.commit()
+
+
+def test_delete_list_writes_one_tombstone(db: Session) -> None:
+    user = create_random_user(db)
+    family = crud.create_family(session=db, name=random_lower_string())
+    family_id = family.id
+    family_list = create_random_family_list(db=db, family_id=family_id)
+    list_id = family_list.id
+    task_ids = [
+        create_random_task(db=db, user_id=user.id, list_id=list_id).id for _ in range(5)
+    ]
+    version = crud.read_family_version(session=db, id=family_id)
+
+    crud.delete_list(session=db, db_list=family_list, batch_size=2)
+    assert db.get(Tombstone, list_id)
+    assert all(db.get(Tombstone, task_id) is None for task_id in task_ids)
+    assert crud.read_family_version(session=db, id=family_id) == version + 1
+
+    # Later task deletes still get their tombstones
+    other_list = create_random_family_list(db=db, family_id=family_id)
+    task = create_random_task(db=db, user_id=user.id, list_id=other_list.id)
+    task_id = task.id
+    crud.delete_task(session=db, db_task=task)
+    assert db.get(Tombstone, task_id)
+
+
+def test_delete_tombstones(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    list_id = personal_list.id
+    crud.delete_list(session=db, db_list=personal_list)
+    assert db.get(Tombstone, list_id)
+
+    deleted = crud.delete_tombstones(
+        session=db, before=datetime.utcnow() + timedelta(minutes=1)
+    )
+    assert deleted >= 1
+    assert db.get(Tombstone, list_id) is None
@@ -4,6 +4,7 @@ from fastapi.encoders import jsonable_encoder
 from sqlmodel import Session
 
 from tests.utils import (
+    count_queries,
     create_random_personal_list,
     create_random_user,
     random_lower_string,
@@ -89,3 +90,21 @@ def test_read_task_by_id(db: Session) -> None:
     assert fetched_task.id == task.id
     assert fetched_task.title == task.title
     assert jsonable_encoder(task) == jsonable_encoder(fetched_task)
+
+
+def test_create_tasks(db: Session) -> None:
+    user = create_random_user(db)
+    personal_list = create_random_personal_list(db=db, user_id=user.id)
+    tasks_in = [
+        TaskCreate(
+            title=random_lower_string(), user_id=user.id, list_id=personal_list.id
+        )
+        for _ in range(1000)
+    ]
+    with count_queries(db) as queries:
+        tasks = crud.create_tasks(session=db, tasks_in=tasks_in)
+
+    assert len(queries) == 1
+    assert [task.title for task in tasks] == [task_in.title for task_in in tasks_in]
+    assert all(task.list_id == personal_list.id for task in tasks)
+    assert crud.read_list_tasks(session=db, list_id=personal_list.id).count == 1000
@@ -91,3 +91,17 @@ def test_demote_admin_to_user(db: Session) -> None:
     assert admin_user.is_admin is True
     demoted_user = crud.demote_admin_to_user(session=db, db_admin_user=admin_user)
     assert demoted_user.is_admin is False
+
+
+def test_transfer_admin(db: Session) -> None:
+    admin_in = UserCreate(
+        email=random_email(), password=random_lower_string(), is_admin=True
+    )
+    admin_user = crud.create_user(session=db, user_create=admin_in)
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    user = crud.create_user(session=db, user_create=user_in)
+    promoted_user = crud.transfer_admin(
+        session=db, db_user=user, db_admin_user=admin_user
+    )
+    assert promoted_user.is_admin is True
+    assert admin_user.is_admin is False
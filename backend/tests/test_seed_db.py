@@ -0,0 +1,57 @@
+import random
+import statistics
+
+import pytest
+from app.core import crud
+from app.core.db import libpq_conninfo
+from app.core.models import Family, Task, User
+from app.seed_db import SeedConfig, seed_chunk, task_count
+from sqlmodel import Session, func, select
+
+from tests.utils import random_lower_string
+
+
+def make_config() -> SeedConfig:
+    return SeedConfig(
+        family_sizes={1: 1, 3: 1},
+        family_lists=2,
+        personal_lists=1,
+        tasks_per_list=20,
+        task_skew=1.0,
+        completion_ratio=0.5,
+        history_days=30,
+        hashed_passwords=["hash"],
+        run=random_lower_string()[:8],
+    )
+
+
+def test_task_count_distribution() -> None:
+    rng = random.Random(0)
+    config = make_config()
+    counts = [task_count(rng, config) for _ in range(20_000)]
+    assert statistics.mean(counts) == pytest.approx(20, rel=0.1)
+    assert statistics.median(counts) < statistics.mean(counts)
+
+
+def test_seed_chunk(db: Session) -> None:
+    config = make_config()
+    counts = seed_chunk(libpq_conninfo(), config, first=0, count=5, seed=1)
+    assert counts["family"] == 5
+    assert 5 <= counts["user"] <= 15
+
+    users = db.exec(
+        select(User).where(User.email.startswith(f"seed-{config.run}-"))
+    ).all()
+    assert len(users) == counts["user"]
+    family_ids = {user.family_id for user in users}
+    family_count = db.exec(
+        select(func.count()).select_from(Family).where(Family.id.in_(family_ids))
+    ).one()
+    assert family_count == 5
+    task_count_statement = (
+        select(func.count())
+        .select_from(Task)
+        .where(Task.user_id.in_([user.id for user in users]))
+    )
+    assert db.exec(task_count_statement).one() == counts["task"]
+    assert crud.read_list_count_drift(session=db) == []
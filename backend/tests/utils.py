@@ -1,11 +1,15 @@
 import random
 import string
 import uuid
+from collections.abc import Generator
+from contextlib import contextmanager
 
 from app.config import settings
 from app.core import crud
+from app.core.db import async_engine
 from app.core.models import List, ListCreate, Task, TaskCreate, User, UserCreate
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session
 
 
@@ -81,3 +85,39 @@ def create_random_family_list(*, db: Session, family_id: uuid.UUID) -> List:
     return crud.create_list(
         session=db, list_in=list_in, relationship_data={"family_id": family_id}
     )
+
+
+@contextmanager
+def count_queries(db: Session) -> Generator[list[str], None, None]:
+    """
+    Collects every SQL statement sent to the database inside the block,
+    through db's engine or, for routes in async mode, the async engine.
+    """
+
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    engines = {db.get_bind(), async_engine.sync_engine}
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(db: Session, limit: int) -> Generator[list[str], None, None]:
+    """
+    Fails if more than limit SQL statements are sent inside the block.
+    """
+
+    with count_queries(db) as statements:
+        yield statements
+    assert len(statements) <= limit, (
+        f"{len(statements)} queries, expected at most {limit}:\n"
+        + "\n".join(statements)
+    )
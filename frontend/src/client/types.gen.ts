@@ -58,6 +58,8 @@ export type ListDisplay = {
   color?: string;
   id: string;
   task_count: number;
+  open_count: number;
+  completed_count: number;
 };
 
 /**
@@ -78,7 +80,9 @@ export type ListPublic = {
  */
 export type ListsPublic = {
   data: Array<ListDisplay>;
-  count: number;
+  count?: number | null;
+  has_more?: boolean;
+  next_cursor?: string | null;
 };
 
 /**
@@ -124,6 +128,20 @@ export type TaskCreate = {
   list_id: string;
 };
 
+/**
+ * Class for display task data to be returned via API.
+ */
+export type TaskDisplay = {
+  title: string;
+  notes?: string | null;
+  completed?: boolean;
+  id: string;
+  created_at: string;
+  updated_at: string;
+  user_id: string;
+  list_id: string;
+};
+
 /**
  * Class for list data to be returned via API.
  */
@@ -138,8 +156,10 @@ export type TaskPublic = {
  * Class for display lists data to be returned via API.
  */
 export type TasksPublic = {
-  data: Array<Task>;
-  count: number;
+  data: Array<TaskDisplay>;
+  count?: number | null;
+  has_more?: boolean;
+  next_cursor?: string | null;
 };
 
 /**
@@ -186,7 +206,9 @@ export type UserPublic = {
  */
 export type UsersPublic = {
   data: Array<UserPublic>;
-  count: number;
+  count?: number | null;
+  has_more?: boolean;
+  next_cursor?: string | null;
 };
 
 export type ValidationError = {